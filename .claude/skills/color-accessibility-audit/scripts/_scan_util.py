@@ -0,0 +1,55 @@
+"""
+Scanner Utilities
+File discovery and process-pool dispatch shared by the scan_*.py scripts.
+"""
+
+import os
+
+# Dependency, build and cache directories never hold source files worth scanning
+SKIP_DIRS = frozenset((
+    "node_modules", ".next", "dist", "build", ".git",
+    "__pycache__", ".turbo", ".cache", "coverage"
+))
+
+
+def walk_files(path: str, suffixes: tuple):
+    """Yield files under path ending in one of suffixes, like os.walk without following symlinked dirs."""
+    try:
+        with os.scandir(path) as it:
+            entries = list(it)
+    except OSError:
+        return
+    for entry in entries:
+        if entry.is_dir():
+            if entry.name not in SKIP_DIRS and not entry.is_symlink():
+                yield from walk_files(entry.path, suffixes)
+        elif entry.name.endswith(suffixes):
+            yield entry.path
+
+
+# Below this many files, process start-up costs more than it saves.
+_PARALLEL_MIN_FILES = 8
+
+
+def map_files(fn, paths, min_files: int = _PARALLEL_MIN_FILES, jobs: int = None):
+    """
+    fn over paths, across up to jobs worker processes (default: one per CPU)
+    when there are at least min_files of them. fn must be picklable (a
+    module-level function or a partial of one). Results come back in input
+    order. Also used for batches of pairs, which are dispatched the same way.
+    """
+    workers = min(jobs or os.cpu_count() or 1, len(paths))
+    if len(paths) < min_files or workers < 2:
+        return map(fn, paths)
+
+    # Deferred: the process pool machinery roughly doubles start-up time, and
+    # small scans never need it
+    from concurrent.futures import ProcessPoolExecutor
+
+    chunksize = max(1, len(paths) // (workers * 4))
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(fn, paths, chunksize=chunksize))
+    except (OSError, NotImplementedError):
+        # No usable process pool on this platform
+        return map(fn, paths)
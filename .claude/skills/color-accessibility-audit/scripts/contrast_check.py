@@ -13,11 +13,15 @@ Accepts pairs of (text_color, background_color) as hex values.
 Outputs contrast ratio, WCAG compliance, fixes, and color blindness analysis.
 """
 
+import os
 import sys
 import re
 import json
 import math
-import colorsys
+from bisect import bisect_right
+from functools import lru_cache, partial
+
+from _scan_util import map_files
 
 # ═══════════════════════════════════════════════════════════════
 # Named CSS Colors
@@ -75,8 +79,16 @@ CVD_MATRICES = {
 # Color Conversion Utilities
 # ═══════════════════════════════════════════════════════════════
 
+_HEX6_RE = re.compile(r"^[0-9a-f]{6}$")
+_LOWER_HEX_DIGITS = frozenset("0123456789abcdef")
+
+
+@lru_cache(maxsize=1024)
 def normalize_hex(color: str) -> str:
     """Convert a color string to 6-digit hex."""
+    # Most inputs are already normalized; on a cache miss, skip the rewriting
+    if len(color) == 7 and color[0] == "#" and _LOWER_HEX_DIGITS.issuperset(color[1:]):
+        return color
     color = color.strip().lower()
     if color in NAMED_COLORS:
         color = NAMED_COLORS[color]
@@ -85,32 +97,91 @@ def normalize_hex(color: str) -> str:
         color = color[0] * 2 + color[1] * 2 + color[2] * 2
     if len(color) == 8:  # strip alpha
         color = color[:6]
-    if len(color) != 6 or not re.match(r"^[0-9a-f]{6}$", color):
+    if len(color) != 6 or not _HEX6_RE.match(color):
         raise ValueError(f"Invalid color: #{color}")
     return f"#{color}"
 
 
 def hex_to_rgb(hex_color: str) -> tuple:
-    h = hex_color.lstrip("#")
-    return (int(h[0:2], 16), int(h[2:4], 16), int(h[4:6], 16))
+    r, g, b = bytes.fromhex(hex_color.lstrip("#"))[:3]
+    return (r, g, b)
 
 
 def rgb_to_hex(r: int, g: int, b: int) -> str:
-    r = max(0, min(255, r))
-    g = max(0, min(255, g))
-    b = max(0, min(255, b))
-    return f"#{r:02x}{g:02x}{b:02x}"
+    # Channels are almost always in range already; only clamp when needed.
+    if r < 0 or r > 255 or g < 0 or g > 255 or b < 0 or b > 255:
+        r = max(0, min(255, r))
+        g = max(0, min(255, g))
+        b = max(0, min(255, b))
+    return "#" + bytes((r, g, b)).hex()
 
 
 def hex_to_hsl(hex_color: str) -> tuple:
-    r, g, b = hex_to_rgb(hex_color)
-    h, l, s = colorsys.rgb_to_hls(r / 255, g / 255, b / 255)
+    return _rgb_to_hsl(*hex_to_rgb(hex_color))
+
+
+def _rgb_to_hsl(r: int, g: int, b: int) -> tuple:
+    # colorsys.rgb_to_hls, inlined for the fixer's hot path
+    r, g, b = r / 255, g / 255, b / 255
+    maxc = max(r, g, b)
+    minc = min(r, g, b)
+    sumc = maxc + minc
+    rangec = maxc - minc
+    l = sumc / 2.0
+    if minc == maxc:
+        return (0.0, 0.0, l * 100)
+    if l <= 0.5:
+        s = rangec / sumc
+    else:
+        s = rangec / (2.0 - maxc - minc)
+    rc = (maxc - r) / rangec
+    gc = (maxc - g) / rangec
+    bc = (maxc - b) / rangec
+    if r == maxc:
+        h = bc - gc
+    elif g == maxc:
+        h = 2.0 + rc - bc
+    else:
+        h = 4.0 + gc - rc
+    h = (h / 6.0) % 1.0
     return (h * 360, s * 100, l * 100)
 
 
 def hsl_to_hex(h: float, s: float, l: float) -> str:
-    r, g, b = colorsys.hls_to_rgb(h / 360, l / 100, s / 100)
-    return rgb_to_hex(int(round(r * 255)), int(round(g * 255)), int(round(b * 255)))
+    return rgb_to_hex(*_hsl_to_rgb(h, s, l))
+
+
+def _hsl_to_rgb(h: float, s: float, l: float) -> tuple:
+    # colorsys.hls_to_rgb, inlined for the fixer's hot path
+    h, l, s = h / 360, l / 100, s / 100
+    if s == 0.0:
+        r = g = b = l
+    else:
+        if l <= 0.5:
+            m2 = l * (1.0 + s)
+        else:
+            m2 = l + s - (l * s)
+        m1 = 2.0 * l - m2
+        r = _hls_channel(m1, m2, h + _ONE_THIRD)
+        g = _hls_channel(m1, m2, h)
+        b = _hls_channel(m1, m2, h - _ONE_THIRD)
+    return (int(round(r * 255)), int(round(g * 255)), int(round(b * 255)))
+
+
+_ONE_THIRD = 1.0 / 3.0
+_ONE_SIXTH = 1.0 / 6.0
+_TWO_THIRD = 2.0 / 3.0
+
+
+def _hls_channel(m1: float, m2: float, hue: float) -> float:
+    hue = hue % 1.0
+    if hue < _ONE_SIXTH:
+        return m1 + (m2 - m1) * hue * 6.0
+    if hue < 0.5:
+        return m2
+    if hue < _TWO_THIRD:
+        return m1 + (m2 - m1) * (_TWO_THIRD - hue) * 6.0
+    return m1
 
 
 def srgb_to_linear(c: float) -> float:
@@ -127,29 +198,89 @@ def linear_to_srgb(c: float) -> float:
     return 1.055 * (c ** (1 / 2.4)) - 0.055
 
 
+# Channels are 8-bit, so every possible sRGB -> linear value is precomputed.
+_SRGB_TO_LINEAR = tuple(srgb_to_linear(v / 255) for v in range(256))
+
+# Same tables pre-multiplied by the WCAG luminance weights, so luminance is
+# three lookups and two adds (bit-identical to weighting at call time).
+_LUMINANCE_R = tuple(0.2126 * c for c in _SRGB_TO_LINEAR)
+_LUMINANCE_G = tuple(0.7152 * c for c in _SRGB_TO_LINEAR)
+_LUMINANCE_B = tuple(0.0722 * c for c in _SRGB_TO_LINEAR)
+
+
+def _encode_srgb8(c: float) -> int:
+    return int(round(linear_to_srgb(c) * 255))
+
+
+def _srgb8_thresholds() -> tuple:
+    """Smallest linear value that encodes to each 8-bit level 1..255."""
+    thresholds = []
+    for level in range(1, 256):
+        c = srgb_to_linear((level - 0.5) / 255)
+        while _encode_srgb8(c) >= level:
+            c = math.nextafter(c, -math.inf)
+        while _encode_srgb8(c) < level:
+            c = math.nextafter(c, math.inf)
+        thresholds.append(c)
+    return tuple(thresholds)
+
+
+_LINEAR_TO_SRGB8_THRESHOLDS = _srgb8_thresholds()
+
+
+def _linear_to_srgb8(c: float) -> int:
+    """Encode a linear channel straight to 8-bit sRGB, clamping to 0-255."""
+    return bisect_right(_LINEAR_TO_SRGB8_THRESHOLDS, c)
+
+
 # ═══════════════════════════════════════════════════════════════
 # WCAG Luminance & Contrast
 # ═══════════════════════════════════════════════════════════════
 
 def relative_luminance(r: int, g: int, b: int) -> float:
     """Calculate relative luminance per WCAG 2.x."""
-    rs = srgb_to_linear(r / 255)
-    gs = srgb_to_linear(g / 255)
-    bs = srgb_to_linear(b / 255)
-    return 0.2126 * rs + 0.7152 * gs + 0.0722 * bs
+    return _LUMINANCE_R[r] + _LUMINANCE_G[g] + _LUMINANCE_B[b]
 
 
 def contrast_ratio(color1: str, color2: str) -> float:
     """Calculate WCAG contrast ratio between two hex colors."""
     r1, g1, b1 = hex_to_rgb(normalize_hex(color1))
     r2, g2, b2 = hex_to_rgb(normalize_hex(color2))
-    l1 = relative_luminance(r1, g1, b1)
-    l2 = relative_luminance(r2, g2, b2)
+    return _contrast_ratio_rgb(r1, g1, b1, r2, g2, b2)
+
+
+def _contrast_ratio_rgb(r1: int, g1: int, b1: int, r2: int, g2: int, b2: int) -> float:
+    return _ratio_from_luminance(relative_luminance(r1, g1, b1), relative_luminance(r2, g2, b2))
+
+
+def _ratio_from_luminance(l1: float, l2: float) -> float:
     lighter = max(l1, l2)
     darker = min(l1, l2)
     return (lighter + 0.05) / (darker + 0.05)
 
 
+def contrast_ratios(pairs) -> list:
+    """
+    Calculate contrast ratios for many (color1, color2) pairs at once.
+    Each distinct color is parsed and its luminance computed only once.
+    """
+    luminance = {}
+    ratios = []
+    for color1, color2 in pairs:
+        ratios.append(_ratio_from_luminance(
+            _cached_luminance(normalize_hex(color1), luminance),
+            _cached_luminance(normalize_hex(color2), luminance),
+        ))
+    return ratios
+
+
+def _cached_luminance(hex_color: str, cache: dict) -> float:
+    lum = cache.get(hex_color)
+    if lum is None:
+        lum = cache[hex_color] = relative_luminance(*hex_to_rgb(hex_color))
+    return lum
+
+
 def wcag_rating(ratio: float) -> dict:
     return {
         "ratio": round(ratio, 2),
@@ -169,105 +300,185 @@ def find_fixed_color(failing_hex: str, anchor_hex: str, target_ratio: float = 4.
     Find the nearest color to failing_hex that achieves target_ratio
     against anchor_hex by adjusting only lightness (preserving hue & saturation).
     """
-    h, s, l = hex_to_hsl(failing_hex)
+    return _find_fixed_color_raw(hex_to_hsl(failing_hex), hex_to_rgb(normalize_hex(anchor_hex)), target_ratio)
+
+
+def find_fixed_colors(failing_hex: str, anchor_hex: str, target_ratios) -> list:
+    """
+    find_fixed_color for several targets at once (e.g. AA and AAA).
+    Returns a (fix_hex, fix_ratio) tuple per target; both colors are parsed once.
+    """
+    failing_hsl = hex_to_hsl(failing_hex)
     anchor_rgb = hex_to_rgb(normalize_hex(anchor_hex))
+    fixes = []
+    for target_ratio in target_ratios:
+        fix_hex = _find_fixed_color_raw(failing_hsl, anchor_rgb, target_ratio)
+        fixes.append((fix_hex, _contrast_ratio_rgb(*hex_to_rgb(fix_hex), *anchor_rgb)))
+    return fixes
+
+
+@lru_cache(maxsize=256)
+def _anchor_bounds(anchor_rgb: tuple, target_ratio: float) -> tuple:
+    """
+    The parts of a fix that depend only on the anchor and target:
+    (dark_target, light_target, ratio_black, ratio_white). Themes have few
+    backgrounds, so these are computed once per background.
+    """
     anchor_lum = relative_luminance(*anchor_rgb)
 
+    # The ratio is monotone in luminance on either side of the anchor, so the
+    # luminance a passing color needs can be solved for directly.
+    dark_target = (anchor_lum + 0.05) / target_ratio - 0.05
+    light_target = target_ratio * (anchor_lum + 0.05) - 0.05
+
+    # Black and white are the extremes of each direction: if one of them
+    # can't reach the target, nothing on that side can either.
+    ratio_black = _contrast_ratio_rgb(0, 0, 0, *anchor_rgb)
+    ratio_white = _contrast_ratio_rgb(255, 255, 255, *anchor_rgb)
+    return dark_target, light_target, ratio_black, ratio_white
+
+
+# Palettes repeat the same failing color on the same background across
+# files and pair types; the fix depends only on these three arguments.
+@lru_cache(maxsize=8192)
+def _find_fixed_color_raw(failing_hsl: tuple, anchor_rgb: tuple, target_ratio: float) -> str:
+    h, s, l = failing_hsl
     original_l = l
+    dark_target, light_target, ratio_black, ratio_white = _anchor_bounds(anchor_rgb, target_ratio)
 
     # Try darkening first (more common need)
-    best_dark = _binary_search_lightness(h, s, original_l, 0, anchor_hex, target_ratio)
+    best_dark = None
+    if ratio_black >= target_ratio:
+        best_dark = _binary_search_lightness(h, s, original_l, 0, dark_target)
     # Try lightening
-    best_light = _binary_search_lightness(h, s, original_l, 100, anchor_hex, target_ratio)
+    best_light = None
+    if ratio_white >= target_ratio:
+        best_light = _binary_search_lightness(h, s, original_l, 100, light_target)
 
     # Pick the one closest to the original lightness
     candidates = []
     if best_dark:
-        dark_h, dark_s, dark_l = hex_to_hsl(best_dark)
-        candidates.append((abs(dark_l - original_l), best_dark))
+        dark_hex, dark_l = best_dark
+        candidates.append((abs(dark_l - original_l), dark_hex))
     if best_light:
-        light_h, light_s, light_l = hex_to_hsl(best_light)
-        candidates.append((abs(light_l - original_l), best_light))
+        light_hex, light_l = best_light
+        candidates.append((abs(light_l - original_l), light_hex))
 
     if candidates:
         candidates.sort(key=lambda x: x[0])
         return candidates[0][1]
 
     # Fallback: black or white
-    ratio_black = contrast_ratio("#000000", anchor_hex)
-    ratio_white = contrast_ratio("#ffffff", anchor_hex)
     return "#000000" if ratio_black >= ratio_white else "#ffffff"
 
 
-def _binary_search_lightness(h, s, start_l, end_l, anchor_hex, target_ratio):
-    """Binary search on lightness to find a passing color."""
-    low = min(start_l, end_l)
-    high = max(start_l, end_l)
+# Stop bisecting once a passing candidate is within this fraction of the
+# target in (luminance + 0.05), the quantity contrast ratios are built from:
+# about 0.2% of the target ratio (0.014 at 7:1) on any background.
+_LUMINANCE_TOLERANCE = 0.002
+# Stop once the bracket is this narrow (lightness units); an 8-bit channel
+# step spans at least ~0.2, so stopping here almost never changes the result.
+_LIGHTNESS_RESOLUTION = 0.002
+
+
+def _binary_search_lightness(h, s, start_l, end_l, target_lum):
+    """
+    Binary search on lightness for the passing color closest to start_l.
+    A color passes when its luminance is at or beyond target_lum in the
+    direction of end_l. Returns (hex, lightness), or None if none passes.
+    """
+    darken = end_l < start_l
+
+    def gap(l):
+        lum = relative_luminance(*_hsl_to_rgb(h, s, l))
+        return target_lum - lum if darken else lum - target_lum
 
     # Check if a solution exists in this range
-    candidate_hex = hsl_to_hex(h, s, end_l)
-    if contrast_ratio(candidate_hex, anchor_hex) < target_ratio:
+    if gap(end_l) < 0:
         return None
 
-    for _ in range(50):  # max iterations
-        mid = (low + high) / 2
-        candidate = hsl_to_hex(h, s, mid)
-        ratio = contrast_ratio(candidate, anchor_hex)
+    passing_l = end_l
+    failing_l = start_l
+    tolerance = _LUMINANCE_TOLERANCE * (target_lum + 0.05)
 
-        if abs(ratio - target_ratio) < 0.05:
-            return candidate
+    for _ in range(20):  # 100 / 2**20 is far below 8-bit resolution
+        if abs(passing_l - failing_l) < _LIGHTNESS_RESOLUTION:
+            break
+        mid = (passing_l + failing_l) / 2
+        mid_gap = gap(mid)
 
-        if ratio >= target_ratio:
-            # Move closer to original
-            if end_l < start_l:
-                low = mid
-            else:
-                high = mid
+        if mid_gap >= 0:
+            passing_l = mid
+            if mid_gap < tolerance:
+                break
         else:
-            # Move further from original
-            if end_l < start_l:
-                high = mid
-            else:
-                low = mid
+            failing_l = mid
 
-    return hsl_to_hex(h, s, (low + high) / 2)
+    return hsl_to_hex(h, s, passing_l), passing_l
 
 
 # ═══════════════════════════════════════════════════════════════
 # Color Blindness Simulation
 # ═══════════════════════════════════════════════════════════════
 
+# Row-major 3x3 coefficients, flattened so the kernel can unpack them once.
+_CVD_COEFFS = {
+    cvd_type: tuple(v for row in matrix for v in row)
+    for cvd_type, matrix in CVD_MATRICES.items()
+}
+
+
 def simulate_cvd(hex_color: str, cvd_type: str) -> str:
     """Simulate how a color appears with a given color vision deficiency."""
     r, g, b = hex_to_rgb(normalize_hex(hex_color))
+    return rgb_to_hex(*_simulate_cvd_rgb(r, g, b, _CVD_COEFFS[cvd_type]))
+
+
+def _simulate_cvd_rgb(r: int, g: int, b: int, coeffs: tuple) -> tuple:
+    """Scalar CVD kernel: 8-bit RGB in, simulated 8-bit RGB out."""
     # Convert to linear RGB
-    rl = srgb_to_linear(r / 255)
-    gl = srgb_to_linear(g / 255)
-    bl = srgb_to_linear(b / 255)
-
-    matrix = CVD_MATRICES[cvd_type]
-    sr = matrix[0][0] * rl + matrix[0][1] * gl + matrix[0][2] * bl
-    sg = matrix[1][0] * rl + matrix[1][1] * gl + matrix[1][2] * bl
-    sb = matrix[2][0] * rl + matrix[2][1] * gl + matrix[2][2] * bl
-
-    # Clamp and convert back to sRGB
-    sr = max(0, min(1, sr))
-    sg = max(0, min(1, sg))
-    sb = max(0, min(1, sb))
-
-    return rgb_to_hex(
-        int(round(linear_to_srgb(sr) * 255)),
-        int(round(linear_to_srgb(sg) * 255)),
-        int(round(linear_to_srgb(sb) * 255)),
-    )
+    return _simulate_cvd_linear(_SRGB_TO_LINEAR[r], _SRGB_TO_LINEAR[g], _SRGB_TO_LINEAR[b], coeffs)
+
+
+def _simulate_cvd_linear(rl: float, gl: float, bl: float, coeffs: tuple) -> tuple:
+    m00, m01, m02, m10, m11, m12, m20, m21, m22 = coeffs
+    sr = m00 * rl + m01 * gl + m02 * bl
+    sg = m10 * rl + m11 * gl + m12 * bl
+    sb = m20 * rl + m21 * gl + m22 * bl
+
+    # Convert back to 8-bit sRGB (out-of-gamut values clamp to 0/255)
+    return (_linear_to_srgb8(sr), _linear_to_srgb8(sg), _linear_to_srgb8(sb))
+
 
+# The dichromacies reported by cvd_analysis, with their matrices stacked in order.
+CVD_ANALYSIS_TYPES = ("protanopia", "deuteranopia", "tritanopia")
+_CVD_ANALYSIS_STACK = tuple(_CVD_COEFFS[t] for t in CVD_ANALYSIS_TYPES)
 
+
+# Scans keep meeting the same palette colors, so each color is simulated
+# (and converted to Lab, below) only once.
+@lru_cache(maxsize=4096)
+def _simulate_cvd_all(r: int, g: int, b: int) -> tuple:
+    """Simulate one color under every analyzed CVD type, linearizing it once."""
+    rl = _SRGB_TO_LINEAR[r]
+    gl = _SRGB_TO_LINEAR[g]
+    bl = _SRGB_TO_LINEAR[b]
+    return tuple(_simulate_cvd_linear(rl, gl, bl, coeffs) for coeffs in _CVD_ANALYSIS_STACK)
+
+
+def _lab_f(t: float) -> float:
+    if t > 0.008856:
+        return t ** (1 / 3)
+    return 7.787 * t + 16 / 116
+
+
+@lru_cache(maxsize=4096)
 def rgb_to_lab(r: int, g: int, b: int) -> tuple:
     """Convert RGB to CIELAB for perceptual difference calculation."""
     # RGB -> XYZ (D65)
-    rl = srgb_to_linear(r / 255)
-    gl = srgb_to_linear(g / 255)
-    bl = srgb_to_linear(b / 255)
+    rl = _SRGB_TO_LINEAR[r]
+    gl = _SRGB_TO_LINEAR[g]
+    bl = _SRGB_TO_LINEAR[b]
 
     x = 0.4124564 * rl + 0.3575761 * gl + 0.1804375 * bl
     y = 0.2126729 * rl + 0.7151522 * gl + 0.0721750 * bl
@@ -276,34 +487,45 @@ def rgb_to_lab(r: int, g: int, b: int) -> tuple:
     # XYZ -> Lab (D65 reference white)
     xn, yn, zn = 0.95047, 1.0, 1.08883
 
-    def f(t):
-        if t > 0.008856:
-            return t ** (1 / 3)
-        return 7.787 * t + 16 / 116
-
-    L = 116 * f(y / yn) - 16
-    a = 500 * (f(x / xn) - f(y / yn))
-    b_val = 200 * (f(y / yn) - f(z / zn))
+    fy = _lab_f(y / yn)
+    L = 116 * fy - 16
+    a = 500 * (_lab_f(x / xn) - fy)
+    b_val = 200 * (fy - _lab_f(z / zn))
     return (L, a, b_val)
 
 
 def delta_e(hex1: str, hex2: str) -> float:
     """Calculate CIE76 ΔE between two colors."""
-    lab1 = rgb_to_lab(*hex_to_rgb(normalize_hex(hex1)))
-    lab2 = rgb_to_lab(*hex_to_rgb(normalize_hex(hex2)))
-    return math.sqrt(sum((a - b) ** 2 for a, b in zip(lab1, lab2)))
+    return _delta_e_rgb(hex_to_rgb(normalize_hex(hex1)), hex_to_rgb(normalize_hex(hex2)))
+
+
+def _delta_e_rgb(rgb1: tuple, rgb2: tuple) -> float:
+    L1, a1, b1 = rgb_to_lab(*rgb1)
+    L2, a2, b2 = rgb_to_lab(*rgb2)
+    dL = L1 - L2
+    da = a1 - a2
+    db = b1 - b2
+    return math.sqrt(dL * dL + da * da + db * db)
+
+
+def cvd_analysis(text_hex: str, bg_hex: str, original_ratio: float = None) -> list:
+    """
+    Analyze color pair under all CVD types. Pass original_ratio when the
+    caller has already measured the pair to avoid recomputing it.
+    """
+    return _cvd_analysis_raw(hex_to_rgb(normalize_hex(text_hex)), hex_to_rgb(normalize_hex(bg_hex)), original_ratio)
 
 
-def cvd_analysis(text_hex: str, bg_hex: str) -> list:
-    """Analyze color pair under all CVD types."""
-    original_ratio = contrast_ratio(text_hex, bg_hex)
+def _cvd_analysis_raw(text_rgb: tuple, bg_rgb: tuple, original_ratio: float = None) -> list:
+    # Stay in 8-bit RGB throughout; hex strings are only built for the output.
+    if original_ratio is None:
+        original_ratio = _contrast_ratio_rgb(*text_rgb, *bg_rgb)
     results = []
 
-    for cvd_type in ["protanopia", "deuteranopia", "tritanopia"]:
-        sim_text = simulate_cvd(text_hex, cvd_type)
-        sim_bg = simulate_cvd(bg_hex, cvd_type)
-        sim_ratio = contrast_ratio(sim_text, sim_bg)
-        de = delta_e(sim_text, sim_bg)
+    simulated = zip(CVD_ANALYSIS_TYPES, _simulate_cvd_all(*text_rgb), _simulate_cvd_all(*bg_rgb))
+    for cvd_type, sim_text, sim_bg in simulated:
+        sim_ratio = _ratio_from_luminance(relative_luminance(*sim_text), relative_luminance(*sim_bg))
+        de = _delta_e_rgb(sim_text, sim_bg)
 
         if de < 3:
             risk = "critical"
@@ -318,8 +540,8 @@ def cvd_analysis(text_hex: str, bg_hex: str) -> list:
 
         results.append({
             "type": cvd_type,
-            "simulated_text": sim_text,
-            "simulated_bg": sim_bg,
+            "simulated_text": rgb_to_hex(*sim_text),
+            "simulated_bg": rgb_to_hex(*sim_bg),
             "simulated_ratio": round(sim_ratio, 2),
             "delta_e": round(de, 1),
             "risk": risk,
@@ -330,35 +552,58 @@ def cvd_analysis(text_hex: str, bg_hex: str) -> list:
 
 def check_risky_hues(text_hex: str, bg_hex: str) -> list:
     """Check for known high-risk hue combinations for CVD."""
-    warnings = []
-    th, ts, tl = hex_to_hsl(text_hex)
-    bh, bs, bl = hex_to_hsl(bg_hex)
+    return _check_risky_hues_raw(*hex_to_hsl(text_hex), *hex_to_hsl(bg_hex))
+
+
+# Hue classes used by the risky-combination checks, as bit flags
+_RED, _GREEN, _BLUE, _PURPLE, _YELLOW, _BROWN = 1, 2, 4, 8, 16, 32
+_SATURATED_HUES = _RED | _GREEN | _BLUE | _PURPLE | _YELLOW
 
-    def is_red(h, s):
-        return (h < 20 or h > 340) and s > 30
 
-    def is_green(h, s):
-        return 80 < h < 170 and s > 30
+def _hue_flags(h: float) -> int:
+    flags = 0
+    if h < 20 or h > 340:
+        flags |= _RED
+    if 80 < h < 170:
+        flags |= _GREEN
+    if 200 < h < 260:
+        flags |= _BLUE
+    if 260 < h < 320:
+        flags |= _PURPLE
+    if 40 < h < 70:
+        flags |= _YELLOW
+    if h < 40 or h > 350:
+        flags |= _BROWN
+    return flags
 
-    def is_blue(h, s):
-        return 200 < h < 260 and s > 30
 
-    def is_purple(h, s):
-        return 260 < h < 320 and s > 30
+# Every class boundary is a whole degree, so a hue's flags depend only on
+# whether it sits exactly on degree i or strictly between i and i + 1.
+_HUE_FLAGS_AT = tuple(_hue_flags(i) for i in range(361))
+_HUE_FLAGS_ABOVE = tuple(_hue_flags(i + 0.5) for i in range(361))
 
-    def is_yellow(h, s):
-        return 40 < h < 70 and s > 30
 
-    def is_brown(h, s, l):
-        return (h < 40 or h > 350) and s > 15 and l < 50
+def _hue_class(h: float, s: float, l: float) -> int:
+    i = int(h)
+    flags = _HUE_FLAGS_AT[i] if h == i else _HUE_FLAGS_ABOVE[i]
+    mask = _SATURATED_HUES if s > 30 else 0
+    if s > 15 and l < 50:
+        mask |= _BROWN
+    return flags & mask
+
+
+def _check_risky_hues_raw(th, ts, tl, bh, bs, bl) -> list:
+    warnings = []
+    t = _hue_class(th, ts, tl)
+    b = _hue_class(bh, bs, bl)
 
-    if (is_red(th, ts) and is_green(bh, bs)) or (is_green(th, ts) and is_red(bh, bs)):
+    if (t & _RED and b & _GREEN) or (t & _GREEN and b & _RED):
         warnings.append("RED-GREEN combination — critical risk for Protanopia & Deuteranopia (~6% of men)")
-    if (is_red(th, ts) and is_brown(bh, bs, bl)) or (is_brown(th, ts, tl) and is_red(bh, bs)):
+    if (t & _RED and b & _BROWN) or (t & _BROWN and b & _RED):
         warnings.append("RED-BROWN combination — high risk for Protanopia & Deuteranopia")
-    if (is_blue(th, ts) and is_purple(bh, bs)) or (is_purple(th, ts) and is_blue(bh, bs)):
+    if (t & _BLUE and b & _PURPLE) or (t & _PURPLE and b & _BLUE):
         warnings.append("BLUE-PURPLE combination — high risk for Tritanopia")
-    if (is_green(th, ts) and is_yellow(bh, bs)) or (is_yellow(th, ts) and is_green(bh, bs)):
+    if (t & _GREEN and b & _YELLOW) or (t & _YELLOW and b & _GREEN):
         warnings.append("GREEN-YELLOW combination — high risk for Deuteranopia")
 
     return warnings
@@ -372,6 +617,59 @@ def analyze_pair(text_color: str, bg_color: str, include_cvd: bool = False) -> d
     text_hex = normalize_hex(text_color)
     bg_hex = normalize_hex(bg_color)
     ratio = contrast_ratio(text_hex, bg_hex)
+    return _analyze_normalized(text_hex, bg_hex, ratio, include_cvd)
+
+
+def analyze_pairs_batch(pairs, include_cvd: bool = False, normalized: bool = False) -> list:
+    """
+    Analyze many (text, bg) pairs. Colors shared between pairs are parsed
+    and measured once; invalid pairs yield an error entry instead of raising.
+    Pass normalized=True when every color is already a lowercase #rrggbb.
+    """
+    luminance = {}
+    results = []
+    for text_color, bg_color in pairs:
+        if normalized:
+            text_hex, bg_hex = text_color, bg_color
+        else:
+            try:
+                text_hex = normalize_hex(text_color)
+                bg_hex = normalize_hex(bg_color)
+            except ValueError as e:
+                results.append({"error": str(e), "text_input": text_color, "bg_input": bg_color})
+                continue
+        ratio = _ratio_from_luminance(
+            _cached_luminance(text_hex, luminance),
+            _cached_luminance(bg_hex, luminance),
+        )
+        results.append(_analyze_normalized(text_hex, bg_hex, ratio, include_cvd))
+    return results
+
+
+# Below this many pairs, process start-up costs more than it saves.
+_PARALLEL_MIN_PAIRS = 32
+
+
+def analyze_pairs_parallel(pairs, include_cvd: bool = False, jobs: int = None) -> list:
+    """
+    Same as analyze_pairs_batch, but spreads large batches across up to jobs
+    worker processes (default: one per CPU). Result order matches the input order.
+    """
+    pairs = list(pairs)
+    workers = jobs or os.cpu_count() or 1
+    if len(pairs) < _PARALLEL_MIN_PAIRS or workers < 2:
+        return analyze_pairs_batch(pairs, include_cvd)
+
+    # One chunk per worker; map_files falls back to running them in turn
+    size = -(-len(pairs) // workers)
+    chunks = [pairs[i:i + size] for i in range(0, len(pairs), size)]
+    parts = map_files(
+        partial(analyze_pairs_batch, include_cvd=include_cvd), chunks, min_files=2, jobs=workers
+    )
+    return [result for part in parts for result in part]
+
+
+def _analyze_normalized(text_hex: str, bg_hex: str, ratio: float, include_cvd: bool) -> dict:
     rating = wcag_rating(ratio)
 
     result = {
@@ -380,18 +678,24 @@ def analyze_pair(text_color: str, bg_color: str, include_cvd: bool = False) -> d
         **rating,
     }
 
+    # Both colors are already normalized: parse them once for every step below
+    text_rgb = hex_to_rgb(text_hex)
+    bg_rgb = hex_to_rgb(bg_hex)
+    if not rating["aaa_body_text"] or include_cvd:
+        text_hsl = _rgb_to_hsl(*text_rgb)
+
     # The Fixer
     if not rating["aa_body_text"]:
-        result["fix_aa"] = find_fixed_color(text_hex, bg_hex, 4.5)
-        result["fix_aa_ratio"] = round(contrast_ratio(result["fix_aa"], bg_hex), 2)
+        result["fix_aa"] = _find_fixed_color_raw(text_hsl, bg_rgb, 4.5)
+        result["fix_aa_ratio"] = round(_contrast_ratio_rgb(*hex_to_rgb(result["fix_aa"]), *bg_rgb), 2)
     if not rating["aaa_body_text"]:
-        result["fix_aaa"] = find_fixed_color(text_hex, bg_hex, 7.0)
-        result["fix_aaa_ratio"] = round(contrast_ratio(result["fix_aaa"], bg_hex), 2)
+        result["fix_aaa"] = _find_fixed_color_raw(text_hsl, bg_rgb, 7.0)
+        result["fix_aaa_ratio"] = round(_contrast_ratio_rgb(*hex_to_rgb(result["fix_aaa"]), *bg_rgb), 2)
 
     # Color blindness analysis
     if include_cvd:
-        result["cvd"] = cvd_analysis(text_hex, bg_hex)
-        result["hue_warnings"] = check_risky_hues(text_hex, bg_hex)
+        result["cvd"] = _cvd_analysis_raw(text_rgb, bg_rgb, ratio)
+        result["hue_warnings"] = _check_risky_hues_raw(*text_hsl, *_rgb_to_hsl(*bg_rgb))
 
     return result
 
@@ -469,16 +773,12 @@ def main():
         print("  python3 contrast_check.py --cvd --json '#9ca3af' '#f3f4f6' '#1a1a1a' '#ffffff'")
         sys.exit(1)
 
-    results = []
-    for i in range(0, len(args), 2):
-        try:
-            result = analyze_pair(args[i], args[i + 1], include_cvd=include_cvd)
-            results.append(result)
-        except ValueError as e:
-            results.append({"error": str(e), "text_input": args[i], "bg_input": args[i + 1]})
+    pairs = list(zip(args[0::2], args[1::2]))
+    results = analyze_pairs_parallel(pairs, include_cvd=include_cvd)
 
     if output_json:
-        print(json.dumps(results, indent=2))
+        json.dump(results, sys.stdout, indent=2)
+        sys.stdout.write("\n")
     else:
         for i, r in enumerate(results, 1):
             print_pair(i, r)
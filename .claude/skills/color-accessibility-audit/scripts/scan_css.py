@@ -24,17 +24,14 @@ import sys
 import re
 import json
 import os
+from functools import lru_cache
 
 # Import the analysis engine from contrast_check.py
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, SCRIPT_DIR)
 from contrast_check import (
     normalize_hex,
-    contrast_ratio,
-    wcag_rating,
-    find_fixed_color,
-    cvd_analysis,
-    check_risky_hues,
+    analyze_pairs_batch,
     NAMED_COLORS,
 )
 
@@ -44,6 +41,7 @@ from contrast_check import (
 
 # Match hex colors: #rgb, #rrggbb, #rrggbbaa
 HEX_RE = re.compile(r"#(?:[0-9a-fA-F]{3,4}){1,2}\b")
+_HEX_DIGITS = frozenset("0123456789abcdefABCDEF")
 
 # Match rgb/rgba: rgb(R, G, B) or rgba(R, G, B, A)
 RGB_RE = re.compile(
@@ -55,11 +53,14 @@ HSL_RE = re.compile(
     r"hsla?\(\s*([\d.]+)\s*,\s*([\d.]+)%\s*,\s*([\d.]+)%\s*(?:,\s*[\d.]+\s*)?\)"
 )
 
+# Named colors, already normalized
+_NAMED_HEX = {name: normalize_hex(value) for name, value in NAMED_COLORS.items()}
+
 # Match CSS custom property usage: var(--name) or var(--name, fallback)
 VAR_RE = re.compile(r"var\(\s*(--[\w-]+)\s*(?:,\s*([^)]+))?\)")
 
-# Match CSS custom property definition: --name: value
-VAR_DEF_RE = re.compile(r"(--[\w-]+)\s*:\s*([^;]+);")
+# Match selector combinators (descendant, >, +, ~)
+COMBINATOR_RE = re.compile(r"[\s>+~]+")
 
 # CSS properties that define text color
 TEXT_PROPS = {"color"}
@@ -71,17 +72,51 @@ BG_PROPS = {"background-color", "background"}
 BORDER_PROPS = {"border-color", "border", "border-top-color", "border-bottom-color",
                 "border-left-color", "border-right-color", "outline-color"}
 
+# Property name -> role, so each declaration costs a single lookup
+PROP_ROLE = {
+    **{prop: "border" for prop in BORDER_PROPS},
+    **{prop: "bg" for prop in BG_PROPS},
+    **{prop: "text" for prop in TEXT_PROPS},
+}
+
 
 def rgb_to_hex_str(r, g, b):
     """Convert RGB integers to hex string."""
     return f"#{int(r):02x}{int(g):02x}{int(b):02x}"
 
 
+_ONE_THIRD = 1.0 / 3.0
+_ONE_SIXTH = 1.0 / 6.0
+_TWO_THIRD = 2.0 / 3.0
+
+
+def _hue_channel(m1, m2, hue):
+    """One RGB channel of colorsys.hls_to_rgb, inlined."""
+    hue = hue % 1.0
+    if hue < _ONE_SIXTH:
+        return m1 + (m2 - m1) * hue * 6.0
+    if hue < 0.5:
+        return m2
+    if hue < _TWO_THIRD:
+        return m1 + (m2 - m1) * (_TWO_THIRD - hue) * 6.0
+    return m1
+
+
 def hsl_to_hex_str(h, s, l):
     """Convert HSL values to hex string."""
-    import colorsys
-    r, g, b = colorsys.hls_to_rgb(float(h) / 360, float(l) / 100, float(s) / 100)
-    return rgb_to_hex_str(r * 255, g * 255, b * 255)
+    # Same arithmetic as colorsys.hls_to_rgb, so truncation matches exactly
+    h = float(h) / 360
+    l = float(l) / 100
+    s = float(s) / 100
+    if s == 0.0:
+        return rgb_to_hex_str(l * 255, l * 255, l * 255)
+    m2 = l * (1.0 + s) if l <= 0.5 else l + s - (l * s)
+    m1 = 2.0 * l - m2
+    return rgb_to_hex_str(
+        _hue_channel(m1, m2, h + _ONE_THIRD) * 255,
+        _hue_channel(m1, m2, h) * 255,
+        _hue_channel(m1, m2, h - _ONE_THIRD) * 255,
+    )
 
 
 def extract_color_value(value_str, css_vars=None):
@@ -95,7 +130,7 @@ def extract_color_value(value_str, css_vars=None):
     value_str = value_str.strip()
 
     # Resolve var() references
-    var_match = VAR_RE.search(value_str)
+    var_match = VAR_RE.search(value_str) if "var(" in value_str else None
     if var_match:
         var_name = var_match.group(1)
         fallback = var_match.group(2)
@@ -110,6 +145,35 @@ def extract_color_value(value_str, css_vars=None):
                 return result
         return None
 
+    # Bare hex literals are by far the most common value
+    if value_str[:1] == "#":
+        color = _parse_hex_fast(value_str)
+        if color:
+            return color
+    # A single keyword ("white", "transparent") can only be a named color
+    elif value_str.isalpha():
+        return _NAMED_HEX.get(value_str.lower())
+
+    return _parse_color_literal(value_str)
+
+
+def _parse_hex_fast(value_str):
+    """Normalize a bare #rgb, #rrggbb or #rrggbbaa literal; None for anything else."""
+    digits = value_str[1:]
+    if len(digits) not in (3, 6, 8) or not _HEX_DIGITS.issuperset(digits):
+        return None
+    digits = digits.lower()
+    if len(digits) == 3:
+        return "#" + digits[0] * 2 + digits[1] * 2 + digits[2] * 2
+    return "#" + digits[:6]
+
+
+@lru_cache(maxsize=4096)
+def _parse_color_literal(value_str):
+    """
+    Extract a color from a value with no var() reference.
+    Cached: the same literals repeat across selectors and files.
+    """
     # Try hsl/hsla
     hsl_match = HSL_RE.search(value_str)
     if hsl_match:
@@ -140,8 +204,8 @@ def extract_color_value(value_str, css_vars=None):
     lower = value_str.lower().strip()
     # Handle compound values like "solid red" by checking each word
     for word in lower.split():
-        if word in NAMED_COLORS:
-            return normalize_hex(NAMED_COLORS[word])
+        if word in _NAMED_HEX:
+            return _NAMED_HEX[word]
 
     # Special cases
     if lower == "transparent" or lower == "inherit" or lower == "initial" or lower == "unset":
@@ -152,56 +216,132 @@ def extract_color_value(value_str, css_vars=None):
 
 def strip_comments(css_text):
     """Remove CSS comments."""
-    return re.sub(r"/\*.*?\*/", "", css_text, flags=re.DOTALL)
+    start = css_text.find("/*")
+    if start == -1:
+        return css_text
+    parts = []
+    pos = 0
+    while start != -1:
+        end = css_text.find("*/", start + 2)
+        if end == -1:
+            # Unterminated comment: leave it in place
+            break
+        parts.append(css_text[pos:start])
+        pos = end + 2
+        start = css_text.find("/*", pos)
+    parts.append(css_text[pos:])
+    return "".join(parts)
+
+
+# Characters the lexer has to stop at; everything in between is skipped in C
+_CSS_TOKEN_RE = re.compile(r"""[{};"']|/\*""")
+
+# A complete string: backslash escapes (including an escaped newline) are
+# consumed, an unescaped newline ends it unterminated
+_CSS_STRING_MATCH = {
+    '"': re.compile(r'"[^"\\\n]*(?:\\[\s\S][^"\\\n]*)*"').match,
+    "'": re.compile(r"'[^'\\\n]*(?:\\[\s\S][^'\\\n]*)*'").match,
+}
+
+
+def _lex_css(css_text):
+    """
+    Split CSS into (selector, body) tuples in a single pass, in document order.
+    At-rule blocks (@media, @layer, @supports, ...) are descended into so their
+    inner rules come out with their own selectors; nested rules are emitted
+    separately from their parent's declarations.
+    """
+    rules = []
+    # Frame: [selector (None for a rule list), chunk start, body parts, slot,
+    #         offset of the last ';' outside a string or comment]
+    stack = [[None, 0, None, None, -1]]
+    search = _CSS_TOKEN_RE.search
+    pos = 0
+
+    while True:
+        match = search(css_text, pos)
+        if match is None:
+            break
+        i = match.start()
+        token = match.group()
+
+        if token == "/*":
+            end = css_text.find("*/", i + 2)
+            if end == -1:
+                break
+            pos = end + 2
+            continue
+
+        if token == '"' or token == "'":
+            # An unterminated string is skipped as a lone quote character
+            string = _CSS_STRING_MATCH[token](css_text, i)
+            pos = string.end() if string else i + 1
+            continue
+
+        frame = stack[-1]
+        if token == ";":
+            frame[4] = i
+            pos = i + 1
+            continue
+
+        if token == "{":
+            # Anything up to the last ';' belongs to the enclosing block
+            start = frame[1]
+            if frame[4] >= start:
+                start = frame[4] + 1
+                if frame[2] is not None:
+                    chunk = css_text[frame[1]:start]
+                    if "/*" in chunk:
+                        chunk = strip_comments(chunk)
+                    frame[2].append(chunk)
+            prelude = css_text[start:i]
+            if "/*" in prelude:
+                prelude = strip_comments(prelude)
+            prelude = prelude.strip()
+            if not prelude or prelude.startswith("@"):
+                stack.append([None, i + 1, None, None, -1])
+            else:
+                rules.append(None)
+                stack.append([prelude, i + 1, [], len(rules) - 1, -1])
+        elif len(stack) > 1:
+            stack.pop()
+            if frame[0] is not None:
+                chunk = css_text[frame[1]:i]
+                if "/*" in chunk:
+                    chunk = strip_comments(chunk)
+                frame[2].append(chunk)
+                rules[frame[3]] = (frame[0], "".join(frame[2]))
+            stack[-1][1] = i + 1
+        else:
+            # Stray closing brace at the top level
+            frame[1] = i + 1
+        pos = i + 1
+
+    return [rule for rule in rules if rule is not None]
 
 
 def parse_css_blocks(css_text):
     """
     Parse CSS into a list of (selector, properties_dict) tuples.
-    Handles nested @media blocks by flattening selectors.
+    Rules inside @media/@layer/@supports blocks are returned with their own selectors.
     """
-    css_text = strip_comments(css_text)
     blocks = []
-
-    # First, extract CSS variable definitions from :root or *
-    var_blocks = re.findall(r"(?::root|html|\*)\s*\{([^}]+)\}", css_text, re.DOTALL)
     css_vars = {}
-    for block_body in var_blocks:
-        for match in VAR_DEF_RE.finditer(block_body):
-            css_vars[match.group(1)] = match.group(2).strip()
-
-    # Flatten @media and @layer blocks — extract inner rules
-    # Simple approach: remove the outer @-rule wrapper
-    def flatten_at_rules(text):
-        result = text
-        # Repeatedly extract content from @media, @layer, @supports blocks
-        pattern = r"@(?:media|layer|supports)[^{]*\{((?:[^{}]|\{[^{}]*\})*)\}"
-        while re.search(pattern, result):
-            result = re.sub(pattern, r"\1", result)
-        return result
-
-    flat_css = flatten_at_rules(css_text)
-
-    # Parse selector { properties } blocks
-    rule_re = re.compile(r"([^{}@]+?)\s*\{([^}]*)\}", re.DOTALL)
-    for match in rule_re.finditer(flat_css):
-        selector = match.group(1).strip()
-        body = match.group(2).strip()
-
-        # Skip @-rules that slipped through
-        if selector.startswith("@"):
-            continue
 
-        # Also extract any local CSS variable definitions
-        for var_match in VAR_DEF_RE.finditer(body):
-            css_vars[var_match.group(1)] = var_match.group(2).strip()
-
-        # Parse properties
+    for selector, body in _lex_css(css_text):
         props = {}
-        for prop_match in re.finditer(r"([\w-]+)\s*:\s*([^;]+);", body):
-            prop_name = prop_match.group(1).strip().lower()
-            prop_value = prop_match.group(2).strip()
-            props[prop_name] = prop_value
+        for declaration in body.split(";"):
+            prop_name, sep, prop_value = declaration.partition(":")
+            if not sep:
+                continue
+            prop_name = prop_name.strip()
+            if not prop_name:
+                continue
+            prop_value = prop_value.strip()
+            # CSS variable definitions keep their case; later ones win
+            if prop_name.startswith("--"):
+                css_vars[prop_name] = prop_value
+            props[prop_name.lower()] = prop_value
 
         if props:
             blocks.append((selector, props))
@@ -209,12 +349,38 @@ def parse_css_blocks(css_text):
     return blocks, css_vars
 
 
+@lru_cache(maxsize=2048)
+def _parse_selector(selector):
+    """
+    Split a selector into the pieces find_color_pairs matches on:
+    (background key, parent candidates innermost first, base element).
+    """
+    first = selector.split(",")[0].strip()
+    head = first.split(":")[0]
+    parents = tuple(
+        part.split(":")[0].split(".")[0].split("#")[0].strip()
+        for part in reversed(COMBINATOR_RE.split(first))
+    )
+    return head.strip(), parents, head.split(".")[0].strip().lower()
+
+
 def find_color_pairs(blocks, css_vars):
     """
     Analyze CSS blocks to find text/background color pairs.
-    Returns a list of issue dicts.
+    Returns parallel columns {"selector", "text_color", "bg_color", "source"};
+    every color in them is a normalized #rrggbb.
     """
-    pairs = []
+    selectors, text_colors, bg_colors, sources = [], [], [], []
+
+    # css_vars is fixed for the whole file, so each distinct value resolves once
+    resolved = {}
+
+    def color_of(value):
+        if value not in resolved:
+            color = extract_color_value(value, css_vars)
+            # Share one string per color across all pair dicts
+            resolved[value] = sys.intern(color) if color else color
+        return resolved[value]
 
     # Track known backgrounds for common selectors (simple inheritance)
     known_backgrounds = {}
@@ -227,31 +393,30 @@ def find_color_pairs(blocks, css_vars):
         border_colors = []
 
         for prop_name, prop_value in props.items():
-            if prop_name in TEXT_PROPS:
-                text_color = extract_color_value(prop_value, css_vars)
-            elif prop_name in BG_PROPS:
-                color = extract_color_value(prop_value, css_vars)
-                if color:
-                    bg_color = color
-            elif prop_name in BORDER_PROPS:
-                color = extract_color_value(prop_value, css_vars)
-                if color:
-                    border_colors.append(color)
+            role = PROP_ROLE.get(prop_name)
+            if role is None:
+                continue
+            if role == "text":
+                text_color = color_of(prop_value)
+                continue
+            color = color_of(prop_value)
+            if not color:
+                continue
+            if role == "bg":
+                bg_color = color
+            else:
+                border_colors.append(color)
+
+        base_sel, parents, base_element = _parse_selector(selector)
 
         # Store known backgrounds for inheritance
         if bg_color:
-            # Normalize selector for matching
-            base_sel = selector.split(",")[0].strip().split(":")[0].strip()
             known_backgrounds[base_sel] = bg_color
 
         # Try to infer background via simple parent matching
         if text_color and not bg_color:
-            # Try to find a parent background
-            base = selector.split(",")[0].strip()
-            parts = re.split(r"[\s>+~]+", base)
             # Walk up the selector chain
-            for i in range(len(parts) - 1, -1, -1):
-                parent = parts[i].split(":")[0].split(".")[0].split("#")[0].strip()
+            for parent in parents:
                 if parent in known_backgrounds:
                     bg_color = known_backgrounds[parent]
                     break
@@ -261,30 +426,30 @@ def find_color_pairs(blocks, css_vars):
             bg_color = default_bg
 
         # Update default background if html/body is explicitly set
-        base_element = selector.split(",")[0].strip().split(":")[0].split(".")[0].strip().lower()
         if base_element in ("html", "body", ":root") and bg_color:
             default_bg = bg_color
 
         # Record the pair if we have a text color
         if text_color:
-            pairs.append({
-                "selector": selector,
-                "text_color": text_color,
-                "bg_color": bg_color,
-                "source": "color + background-color",
-            })
+            selectors.append(selector)
+            text_colors.append(text_color)
+            bg_colors.append(bg_color)
+            sources.append("color + background-color")
 
         # Also check border colors against the background (non-text contrast SC 1.4.11)
         if border_colors and bg_color:
             for bc in border_colors:
-                pairs.append({
-                    "selector": selector,
-                    "text_color": bc,
-                    "bg_color": bg_color,
-                    "source": "border vs background (SC 1.4.11)",
-                })
+                selectors.append(selector)
+                text_colors.append(bc)
+                bg_colors.append(bg_color)
+                sources.append("border vs background (SC 1.4.11)")
 
-    return pairs
+    return {
+        "selector": selectors,
+        "text_color": text_colors,
+        "bg_color": bg_colors,
+        "source": sources,
+    }
 
 
 # ═══════════════════════════════════════════════════════════════
@@ -295,43 +460,26 @@ def analyze_css_pairs(pairs, include_cvd=False):
     """Run full contrast analysis on each extracted pair."""
     results = []
 
-    for pair in pairs:
-        try:
-            text_hex = normalize_hex(pair["text_color"])
-            bg_hex = normalize_hex(pair["bg_color"])
-        except ValueError as e:
-            results.append({
-                "selector": pair["selector"],
-                "error": str(e),
-            })
-            continue
-
-        ratio = contrast_ratio(text_hex, bg_hex)
-        rating = wcag_rating(ratio)
-
+    # Selectors often share the same text/background combination; analyze each
+    # distinct combination once and reuse it for every selector.
+    text_colors, bg_colors = pairs["text_color"], pairs["bg_color"]
+    distinct = {}
+    for key in zip(text_colors, bg_colors):
+        distinct.setdefault(key, len(distinct))
+    # find_color_pairs only produces normalized hex, so skip re-validating it.
+    analyses = analyze_pairs_batch(list(distinct), include_cvd, normalized=True)
+
+    for selector, text_hex, bg_hex, source in zip(
+        pairs["selector"], text_colors, bg_colors, pairs["source"]
+    ):
+        analysis = analyses[distinct[(text_hex, bg_hex)]]
         result = {
-            "selector": pair["selector"],
+            "selector": selector,
             "text_color": text_hex,
             "background_color": bg_hex,
-            "source": pair["source"],
-            **rating,
+            "source": source,
         }
-
-        # The Fixer
-        if not rating["aa_body_text"]:
-            fix = find_fixed_color(text_hex, bg_hex, 4.5)
-            result["fix_aa"] = fix
-            result["fix_aa_ratio"] = round(contrast_ratio(fix, bg_hex), 2)
-        if not rating["aaa_body_text"]:
-            fix = find_fixed_color(text_hex, bg_hex, 7.0)
-            result["fix_aaa"] = fix
-            result["fix_aaa_ratio"] = round(contrast_ratio(fix, bg_hex), 2)
-
-        # CVD
-        if include_cvd:
-            result["cvd"] = cvd_analysis(text_hex, bg_hex)
-            result["hue_warnings"] = check_risky_hues(text_hex, bg_hex)
-
+        result.update(analysis)
         results.append(result)
 
     return results
@@ -339,106 +487,119 @@ def analyze_css_pairs(pairs, include_cvd=False):
 
 def print_report(results, filepath):
     """Print a human-readable report."""
-    issues = [r for r in results if not r.get("aa_body_text", True)]
-    warnings = [r for r in results if r.get("aa_body_text", False) and not r.get("aaa_body_text", True)]
-    passing = [r for r in results if r.get("aaa_body_text", False)]
-    errors = [r for r in results if "error" in r]
+    lines = []
+    out = lines.append
+    issues, warnings, passing, errors = [], [], [], []
+    selectors = set()
+    for r in results:
+        selectors.add(r.get("selector", ""))
+        if "error" in r:
+            errors.append(r)
+        elif not r["aa_body_text"]:
+            issues.append(r)
+        elif not r["aaa_body_text"]:
+            warnings.append(r)
+        else:
+            passing.append(r)
 
     total = len(results) - len(errors)
 
-    print()
-    print(f"{'═' * 60}")
-    print(f"  COLOR CONTRAST SCAN REPORT")
-    print(f"  File: {filepath}")
-    print(f"{'═' * 60}")
-    print()
-    print(f"  Found {total} color pairs across {len(set(r.get('selector','') for r in results))} selectors")
-    print()
-    print(f"  ❌ FAIL AA:         {len(issues)} pairs")
-    print(f"  ⚠️  Pass AA only:   {len(warnings)} pairs")
-    print(f"  ✅ Pass AAA:        {len(passing)} pairs")
+    out("")
+    out(f"{'═' * 60}")
+    out(f"  COLOR CONTRAST SCAN REPORT")
+    out(f"  File: {filepath}")
+    out(f"{'═' * 60}")
+    out("")
+    out(f"  Found {total} color pairs across {len(selectors)} selectors")
+    out("")
+    out(f"  ❌ FAIL AA:         {len(issues)} pairs")
+    out(f"  ⚠️  Pass AA only:   {len(warnings)} pairs")
+    out(f"  ✅ Pass AAA:        {len(passing)} pairs")
     if errors:
-        print(f"  ⛔ Parse errors:    {len(errors)}")
-    print()
+        out(f"  ⛔ Parse errors:    {len(errors)}")
+    out("")
 
     # Show failures first (most important)
     if issues:
-        print(f"{'─' * 60}")
-        print(f"  ❌ FAILING PAIRS (below AA 4.5:1)")
-        print(f"{'─' * 60}")
+        out(f"{'─' * 60}")
+        out(f"  ❌ FAILING PAIRS (below AA 4.5:1)")
+        out(f"{'─' * 60}")
         for r in issues:
-            _print_issue(r)
+            _format_issue(r, out)
 
     # Show AA-only (pass AA but not AAA)
     if warnings:
-        print(f"{'─' * 60}")
-        print(f"  ⚠️  AA ONLY (pass AA but fail AAA 7:1)")
-        print(f"{'─' * 60}")
+        out(f"{'─' * 60}")
+        out(f"  ⚠️  AA ONLY (pass AA but fail AAA 7:1)")
+        out(f"{'─' * 60}")
         for r in warnings:
-            _print_issue(r)
+            _format_issue(r, out)
 
     # Show passing (briefly)
     if passing:
-        print(f"{'─' * 60}")
-        print(f"  ✅ PASSING AAA")
-        print(f"{'─' * 60}")
+        out(f"{'─' * 60}")
+        out(f"  ✅ PASSING AAA")
+        out(f"{'─' * 60}")
         for r in passing:
-            print(f"    {r['selector']}")
-            print(f"      {r['text_color']} on {r['background_color']}  →  {r['ratio']}:1 ✅")
-            print()
+            out(f"    {r['selector']}")
+            out(f"      {r['text_color']} on {r['background_color']}  →  {r['ratio']}:1 ✅")
+            out("")
 
     if errors:
-        print(f"{'─' * 60}")
-        print(f"  ⛔ ERRORS")
-        print(f"{'─' * 60}")
+        out(f"{'─' * 60}")
+        out(f"  ⛔ ERRORS")
+        out(f"{'─' * 60}")
         for r in errors:
-            print(f"    {r['selector']}: {r['error']}")
-        print()
+            out(f"    {r['selector']}: {r['error']}")
+        out("")
 
     # Summary
-    print(f"{'═' * 60}")
+    out(f"{'═' * 60}")
     if not issues:
-        print(f"  ✅ All color pairs pass WCAG AA!")
+        out(f"  ✅ All color pairs pass WCAG AA!")
         if not warnings:
-            print(f"  ✅ All color pairs also pass WCAG AAA!")
+            out(f"  ✅ All color pairs also pass WCAG AAA!")
     else:
-        print(f"  ❌ {len(issues)} pair(s) need fixing to meet WCAG AA.")
-        print(f"     The suggested fix hex codes above are ready to copy-paste.")
-    print(f"{'═' * 60}")
-    print()
-
-
-def _print_issue(r):
-    """Print a single issue with full details."""
-    print()
-    print(f"    Selector:   {r['selector']}")
-    print(f"    Source:      {r['source']}")
-    print(f"    Text:        {r['text_color']}")
-    print(f"    Background:  {r['background_color']}")
-    print(f"    Contrast:    {r['ratio']}:1")
-    print(f"    AA Body:     {'✅' if r['aa_body_text'] else '❌'}  "
+        out(f"  ❌ {len(issues)} pair(s) need fixing to meet WCAG AA.")
+        out(f"     The suggested fix hex codes above are ready to copy-paste.")
+    out(f"{'═' * 60}")
+    out("")
+
+    # One write for the whole report instead of a print per line
+    sys.stdout.write("\n".join(lines) + "\n")
+
+
+def _format_issue(r, out):
+    """Append the lines for a single issue with full details to out."""
+    out("")
+    out(f"    Selector:   {r['selector']}")
+    out(f"    Source:      {r['source']}")
+    out(f"    Text:        {r['text_color']}")
+    out(f"    Background:  {r['background_color']}")
+    out(f"    Contrast:    {r['ratio']}:1")
+    out(f"    AA Body:     {'✅' if r['aa_body_text'] else '❌'}  "
           f"AA Large: {'✅' if r['aa_large_text'] else '❌'}  "
           f"AAA Body: {'✅' if r['aaa_body_text'] else '❌'}  "
           f"AAA Large: {'✅' if r['aaa_large_text'] else '❌'}")
 
     if "fix_aa" in r:
-        print(f"    Fix for AA:  {r['fix_aa']}  →  {r['fix_aa_ratio']}:1")
+        out(f"    Fix for AA:  {r['fix_aa']}  →  {r['fix_aa_ratio']}:1")
     if "fix_aaa" in r:
-        print(f"    Fix for AAA: {r['fix_aaa']}  →  {r['fix_aaa_ratio']}:1")
+        out(f"    Fix for AAA: {r['fix_aaa']}  →  {r['fix_aaa_ratio']}:1")
 
     if r.get("cvd"):
         icons = {"protanopia": "🔴", "deuteranopia": "🟢", "tritanopia": "🔵"}
         for cvd in r["cvd"]:
             icon = icons.get(cvd["type"], "•")
             risk_str = {"critical": "❌ CRITICAL", "high": "⚠️  HIGH", "warning": "⚠️  WARN", "ok": "✅ OK"}
-            print(f"    {icon} {cvd['type']:15s} {cvd['simulated_ratio']:5.2f}:1  "
+            out(f"    {icon} {cvd['type']:15s} {cvd['simulated_ratio']:5.2f}:1  "
                   f"ΔE={cvd['delta_e']:5.1f}  {risk_str.get(cvd['risk'], cvd['risk'])}")
 
     if r.get("hue_warnings"):
         for w in r["hue_warnings"]:
-            print(f"    ⚠️  {w}")
+            out(f"    ⚠️  {w}")
 
-    print()
+    out("")
 
 
 # ═══════════════════════════════════════════════════════════════
@@ -472,8 +633,11 @@ def main():
         print(f"Error: File not found: {filepath}")
         sys.exit(1)
 
-    with open(filepath, "r", encoding="utf-8", errors="replace") as f:
-        css_text = f.read()
+    # One read and one decode; only fix up line endings when the file has any
+    with open(filepath, "rb") as f:
+        css_text = f.read().decode("utf-8", errors="replace")
+    if "\r" in css_text:
+        css_text = css_text.replace("\r\n", "\n").replace("\r", "\n")
 
     # Parse
     blocks, css_vars = parse_css_blocks(css_text)
@@ -485,26 +649,27 @@ def main():
     # Extract pairs
     pairs = find_color_pairs(blocks, css_vars)
 
-    if not pairs:
+    if not pairs["selector"]:
         print(f"No text/background color pairs found in {filepath}")
         print("This might mean colors are defined via JavaScript, Tailwind utilities, or external stylesheets.")
         sys.exit(0)
 
-    # Deduplicate identical pairs (same colors, different selectors get merged)
-    seen = set()
-    unique_pairs = []
-    for p in pairs:
-        key = (p["text_color"], p["bg_color"], p["selector"])
-        if key not in seen:
-            seen.add(key)
-            unique_pairs.append(p)
+    # Deduplicate identical pairs (same colors, different selectors get merged);
+    # the first occurrence wins and keeps its position
+    unique = {}
+    for i, key in enumerate(zip(pairs["text_color"], pairs["bg_color"], pairs["selector"])):
+        unique.setdefault(key, i)
+    if len(unique) < len(pairs["selector"]):
+        keep = list(unique.values())
+        pairs = {column: [values[i] for i in keep] for column, values in pairs.items()}
 
     # Analyze
-    results = analyze_css_pairs(unique_pairs, include_cvd=include_cvd)
+    results = analyze_css_pairs(pairs, include_cvd=include_cvd)
 
     # Output
     if output_json:
-        print(json.dumps(results, indent=2))
+        json.dump(results, sys.stdout, indent=2)
+        sys.stdout.write("\n")
     else:
         print_report(results, filepath)
 
@@ -0,0 +1,59 @@
+import unittest
+from scan_css import parse_css_blocks, find_color_pairs
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+class TestCssLexer(unittest.TestCase):
+
+    def pairs(self, css_text):
+        """Helper returning (selector, text color, background color) for each pair"""
+        pairs = find_color_pairs(*parse_css_blocks(css_text))
+        return list(zip(pairs["selector"], pairs["text_color"], pairs["bg_color"]))
+
+    def test_semicolon_in_attribute_selector(self):
+        """A ';' inside a quoted attribute value does not cut the selector"""
+        css = (
+            '[style*="color: red;"] { color:#767676; background-color:#fff }\n'
+            '[style*="color: red;"] .note { color:#aaaaaa }'
+        )
+        self.assertEqual(self.pairs(css), [
+            ('[style*="color: red;"]', "#767676", "#ffffff"),
+            ('[style*="color: red;"] .note', "#aaaaaa", "#ffffff"),
+        ])
+
+    def test_escaped_quote_in_string(self):
+        """An escaped quote does not end the string it appears in"""
+        css = (
+            '.a::after{content:"it\\"s"}.b{color:#111;background:#fff}'
+            '.c{font-family:"Fira Sans"}.d{color:#222;background:#eee}'
+        )
+        self.assertEqual(self.pairs(css), [
+            (".b", "#111111", "#ffffff"),
+            (".d", "#222222", "#eeeeee"),
+        ])
+
+    def test_escaped_newline_in_string(self):
+        """A backslash-newline continues the string instead of ending it"""
+        css = (
+            ".x{background:url('data:image/svg+xml,<svg a=\"b\">\\\n</svg>')}"
+            ".y{color:#333;background:#fff}"
+            ".z{font-family:'Fira Sans'}.w{color:#444;background:#eee}"
+        )
+        self.assertEqual(self.pairs(css), [
+            (".y", "#333333", "#ffffff"),
+            (".w", "#444444", "#eeeeee"),
+        ])
+
+    def test_brace_in_string(self):
+        """Braces inside strings do not open or close blocks"""
+        css = '.c { content: "}"; color:#111; background:#fff }'
+        self.assertEqual(self.pairs(css), [(".c", "#111111", "#ffffff")])
+
+    def test_at_rule_statement(self):
+        """Statements such as @import do not leak into the next selector"""
+        css = '@import "x;y"; .b { color:#000; background:#fff }'
+        self.assertEqual(self.pairs(css), [(".b", "#000000", "#ffffff")])
+
+
+if __name__ == '__main__':
+    unittest.main()
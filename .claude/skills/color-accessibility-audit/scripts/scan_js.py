@@ -27,18 +27,18 @@ import re
 import json
 import os
 import glob
+from bisect import bisect_right
+from collections import namedtuple
+from functools import lru_cache
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, SCRIPT_DIR)
 from contrast_check import (
     normalize_hex,
-    contrast_ratio,
-    wcag_rating,
-    find_fixed_color,
-    cvd_analysis,
-    check_risky_hues,
+    analyze_pairs_batch,
     NAMED_COLORS,
 )
+from _scan_util import map_files, walk_files
 
 # ═══════════════════════════════════════════════════════════════
 # Color Extraction Patterns
@@ -53,6 +53,7 @@ HEX_IN_STRING_RE = re.compile(
 HEX_ASSIGN_RE = re.compile(
     r"""(\#(?:[0-9a-fA-F]{3,4}){1,2})(?=\s*[,;}\])\n]|$)"""
 )
+_HEX_DIGITS = frozenset("0123456789abcdefABCDEF")
 
 # rgb()/rgba() in strings or template literals
 RGB_RE = re.compile(
@@ -64,42 +65,88 @@ HSL_RE = re.compile(
     r"""hsla?\(\s*([\d.]+)\s*,\s*([\d.]+)%\s*,\s*([\d.]+)%\s*(?:,\s*[\d.]+\s*)?\)"""
 )
 
-# ═══════════════════════════════════════════════════════════════
-# Semantic Key Detection
-# ═══════════════════════════════════════════════════════════════
-
-# Keys that indicate TEXT color
-TEXT_KEYS = re.compile(
-    r"""(?:^|[._-])(?:"""
-    r"""color|text|foreground|fg|font[_-]?color|text[_-]?color|"""
-    r"""label[_-]?color|title[_-]?color|heading[_-]?color|"""
-    r"""body[_-]?color|caption[_-]?color|subtitle[_-]?color|"""
-    r"""placeholder[_-]?color|hint[_-]?color|link[_-]?color|"""
-    r"""icon[_-]?color|on[_-]?(?:primary|secondary|surface|background|error|success|warning)"""
-    r""")(?:[._-]|$)""",
-    re.IGNORECASE,
+# A one-line string literal, quotes included. Unrolled so matching is linear:
+# escapes are consumed in pairs and the closing quote must match the opening one.
+QUOTED_VALUE = (
+    r"""(?:'[^'\\\n]*(?:\\.[^'\\\n]*)*'"""
+    r'''|"[^"\\\n]*(?:\\.[^"\\\n]*)*"'''
+    r"""|`[^`\\\n]*(?:\\.[^`\\\n]*)*`)"""
 )
 
-# Keys that indicate BACKGROUND color
-BG_KEYS = re.compile(
-    r"""(?:^|[._-])(?:"""
-    r"""background|bg|surface|backdrop|fill|canvas|"""
-    r"""bg[_-]?color|background[_-]?color|"""
-    r"""card[_-]?(?:bg|background)|page[_-]?(?:bg|background)|"""
-    r"""container[_-]?(?:bg|background)|panel[_-]?(?:bg|background)|"""
-    r"""primary|secondary|accent|base"""
-    r""")(?:[._-]|$)""",
-    re.IGNORECASE,
+# Key/value patterns, fused so the code is scanned once:
+#   obj      — object property: key: 'value' or "key": "value"
+#   var      — const/let/var name = 'value'
+#   inline   — JSX inline style: style={{ color: '#hex' }}
+#   template — color: `#hex` or bg = '#hex'
+# Tailwind config colors ('brand-light': '#hex') are object properties.
+KEY_VALUE_RE = re.compile(
+    # Every alternative starts at the start of the code, a delimiter, or one
+    # of these keyword initials; the lookahead rejects all other positions
+    # before the four alternatives are tried one by one
+    r"""(?:(?=[{,;\nbceflsv])|\A)"""
+    r"""(?:(?P<obj>(?:^|[{,;\n])\s*"""
+    r"""['"]?(?P<obj_key>[\w.$-]+)['"]?\s*:\s*"""
+    r"""(?P<obj_val>""" + QUOTED_VALUE + r"""))"""
+    r"""|(?P<var>(?:const|let|var|export\s+(?:const|let))\s+"""
+    r"""(?P<var_key>[\w$]+)\s*(?::\s*\w+\s*)?=\s*(?P<var_val>""" + QUOTED_VALUE + r"""))"""
+    r"""|(?P<inline>(?P<inline_key>color|backgroundColor|borderColor|background)\s*:\s*"""
+    r"""(?P<inline_val>""" + QUOTED_VALUE + r"""))"""
+    r"""|(?P<template>(?:color|background|bg|fill|stroke)\s*[:=]\s*[`'](?P<template_val>\#[0-9a-fA-F]{3,8})[`']))""",
+    re.MULTILINE,
 )
 
-# Keys that indicate BORDER color (non-text contrast)
-BORDER_KEYS = re.compile(
-    r"""(?:^|[._-])(?:"""
-    r"""border|outline|divider|separator|stroke|ring"""
-    r""")(?:[._-]|$)""",
-    re.IGNORECASE,
+# String literals (group 1) or comments, in one linear scan. All loops are
+# unrolled so nothing backtracks; quoted strings cannot span lines, and
+# "//" right after a colon (http://) is not a comment.
+COMMENT_OR_STRING_RE = re.compile(
+    r"""('[^'\\\n]*(?:\\.[^'\\\n]*)*'"""
+    r'''|"[^"\\\n]*(?:\\.[^"\\\n]*)*"'''
+    r"""|`[^`\\]*(?:\\.[^`\\]*)*`)"""
+    r"""|/\*[^*]*\*+(?:[^/*][^*]*\*+)*/"""
+    r"""|(?<![:\\])//[^\n]*"""
 )
 
+# A key opening a line: key: / key = / key {
+LINE_KEY_RE = re.compile(r"""['"]?([\w.$-]+)['"]?\s*[:={]""")
+
+# ═══════════════════════════════════════════════════════════════
+# Semantic Key Detection
+# ═══════════════════════════════════════════════════════════════
+
+# Keys are classified by their tokens: the lowercased path split on ".", "_"
+# and "-". Compound names written without a separator (textColor, cardBg)
+# are single tokens and listed as such.
+
+# "on" + surface marks a text color (onPrimary, on-surface, on_error)
+ON_SURFACES = frozenset((
+    "primary", "secondary", "surface", "background", "error", "success", "warning",
+))
+
+# Tokens that indicate TEXT color
+TEXT_TOKENS = frozenset((
+    "color", "text", "foreground", "fg", "fontcolor", "textcolor",
+    "labelcolor", "titlecolor", "headingcolor",
+    "bodycolor", "captioncolor", "subtitlecolor",
+    "placeholdercolor", "hintcolor", "linkcolor",
+    "iconcolor",
+)) | {"on" + surface for surface in ON_SURFACES}
+
+# Tokens that indicate BACKGROUND color
+BG_TOKENS = frozenset((
+    "background", "bg", "surface", "backdrop", "fill", "canvas",
+    "bgcolor", "backgroundcolor",
+    "cardbg", "cardbackground", "pagebg", "pagebackground",
+    "containerbg", "containerbackground", "panelbg", "panelbackground",
+    "primary", "secondary", "accent", "base",
+))
+
+# Tokens that indicate BORDER color (non-text contrast)
+BORDER_TOKENS = frozenset((
+    "border", "outline", "divider", "separator", "stroke", "ring",
+))
+
+KEY_SEPARATOR_RE = re.compile(r"([._-])")
+
 # Keys that indicate a color pair context (e.g., a theme group)
 CONTEXT_KEYS = re.compile(
     r"""(?:^|[._-])(?:"""
@@ -114,11 +161,19 @@ CONTEXT_KEYS = re.compile(
 
 def classify_key(key):
     """Classify a key as text, background, border, or unknown."""
-    if TEXT_KEYS.search(key):
+    # Even indices are tokens, odd indices the separators between them
+    parts = KEY_SEPARATOR_RE.split(key.lower())
+    tokens = set(parts[::2])
+    if not TEXT_TOKENS.isdisjoint(tokens):
         return "text"
-    if BG_KEYS.search(key):
+    if "on" in tokens:
+        # "on" and its surface as two tokens (on-surface); a "." ends the name
+        for i in range(0, len(parts) - 2, 2):
+            if parts[i] == "on" and parts[i + 1] != "." and parts[i + 2] in ON_SURFACES:
+                return "text"
+    if not BG_TOKENS.isdisjoint(tokens):
         return "background"
-    if BORDER_KEYS.search(key):
+    if not BORDER_TOKENS.isdisjoint(tokens):
         return "border"
     return "unknown"
 
@@ -131,18 +186,56 @@ def rgb_to_hex_str(r, g, b):
     return f"#{int(r):02x}{int(g):02x}{int(b):02x}"
 
 
+_ONE_THIRD = 1.0 / 3.0
+_ONE_SIXTH = 1.0 / 6.0
+_TWO_THIRD = 2.0 / 3.0
+
+
+def _hue_channel(m1, m2, hue):
+    """One RGB channel of colorsys.hls_to_rgb, inlined."""
+    hue = hue % 1.0
+    if hue < _ONE_SIXTH:
+        return m1 + (m2 - m1) * hue * 6.0
+    if hue < 0.5:
+        return m2
+    if hue < _TWO_THIRD:
+        return m1 + (m2 - m1) * (_TWO_THIRD - hue) * 6.0
+    return m1
+
+
 def hsl_to_hex_str(h, s, l):
-    import colorsys
-    r, g, b = colorsys.hls_to_rgb(float(h) / 360, float(l) / 100, float(s) / 100)
-    return rgb_to_hex_str(r * 255, g * 255, b * 255)
+    # Same arithmetic as colorsys.hls_to_rgb, so truncation matches exactly
+    h = float(h) / 360
+    l = float(l) / 100
+    s = float(s) / 100
+    if s == 0.0:
+        return rgb_to_hex_str(l * 255, l * 255, l * 255)
+    m2 = l * (1.0 + s) if l <= 0.5 else l + s - (l * s)
+    m1 = 2.0 * l - m2
+    return rgb_to_hex_str(
+        _hue_channel(m1, m2, h + _ONE_THIRD) * 255,
+        _hue_channel(m1, m2, h) * 255,
+        _hue_channel(m1, m2, h - _ONE_THIRD) * 255,
+    )
 
 
+# Theme files repeat the same few values (palette shades, '#fff') many times,
+# and the cache spans every file in a recursive scan
+@lru_cache(maxsize=4096)
 def extract_color_from_value(value_str):
     """Try to extract a hex color from a JS value string."""
     value_str = value_str.strip().strip("'\"`,;")
 
+    # Most JS colors are a bare hex literal: accept it without any regex
+    if (value_str[:1] == "#" and len(value_str) in (4, 5, 7, 9)
+            and _HEX_DIGITS.issuperset(value_str[1:])):
+        try:
+            return normalize_hex(value_str)
+        except ValueError:
+            return None
+
     # HSL
-    hsl_match = HSL_RE.search(value_str)
+    hsl_match = HSL_RE.search(value_str) if "hsl" in value_str else None
     if hsl_match:
         try:
             return normalize_hex(hsl_to_hex_str(
@@ -152,7 +245,7 @@ def extract_color_from_value(value_str):
             pass
 
     # RGB
-    rgb_match = RGB_RE.search(value_str)
+    rgb_match = RGB_RE.search(value_str) if "rgb" in value_str else None
     if rgb_match:
         try:
             return normalize_hex(rgb_to_hex_str(
@@ -182,12 +275,15 @@ def extract_color_from_value(value_str):
 # ═══════════════════════════════════════════════════════════════
 
 def strip_comments(code):
-    """Remove JS/TS single-line and multi-line comments."""
-    # Multi-line comments
-    code = re.sub(r"/\*.*?\*/", "", code, flags=re.DOTALL)
-    # Single-line comments (but not inside strings — simplified approach)
-    code = re.sub(r"(?<!['\"`:\\])//.*?$", "", code, flags=re.MULTILINE)
-    return code
+    """Remove JS/TS single-line and multi-line comments, leaving strings intact."""
+    if "/" not in code:
+        return code
+    # Strings are written back unchanged; comments are dropped
+    return COMMENT_OR_STRING_RE.sub(_keep_string, code)
+
+
+def _keep_string(match):
+    return match.group(1) or ""
 
 
 def extract_key_value_pairs(code):
@@ -202,106 +298,139 @@ def extract_key_value_pairs(code):
     """
     entries = []
 
-    # Pattern 1: Object property — key: 'value' or key: "value"
-    # Matches:  color: '#fff',  backgroundColor: "rgb(0,0,0)",  primary: '#3b82f6'
-    obj_prop_re = re.compile(
-        r"""(?:^|[{,;\n])\s*"""
-        r"""['"]?([\w.$-]+)['"]?\s*:\s*"""
-        r"""['"`]([^'"`\n]+)['"`]""",
-        re.MULTILINE,
-    )
-    for m in obj_prop_re.finditer(code):
-        key = m.group(1).strip()
-        value = m.group(2).strip()
-        color = extract_color_from_value(value)
+    # One pass over the code; at each position the alternatives are tried in
+    # the order below, so an object property is never also reported as an
+    # inline style or template entry.
+    for m in KEY_VALUE_RE.finditer(code):
+        kind = m.lastgroup
+        pos = m.start()
+        if kind == "obj":
+            key, value, source = m.group("obj_key"), m.group("obj_val"), "object_property"
+            # The match starts at the preceding delimiter, which may sit on an
+            # earlier line; locate the entry at its key instead
+            pos = m.start("obj_key")
+        elif kind == "var":
+            key, value, source = m.group("var_key"), m.group("var_val"), "variable"
+        elif kind == "inline":
+            key, value, source = m.group("inline_key"), m.group("inline_val"), "inline_style"
+        else:
+            key, value, source = "template_color", m.group("template_val"), "template"
+        if value[0] in "'\"`":
+            # obj/var/inline values are captured with their quotes
+            value = value[1:-1]
+        color = extract_color_from_value(value.strip())
         if color:
-            entries.append((key, color, m.start(), "object_property"))
+            entries.append((key.strip(), color, pos, source))
 
-    # Pattern 2: Variable assignment — const/let/var name = 'color'
-    var_assign_re = re.compile(
-        r"""(?:const|let|var|export\s+(?:const|let))\s+"""
-        r"""([\w$]+)\s*(?::\s*\w+\s*)?=\s*['"`]([^'"`\n]+)['"`]""",
-        re.MULTILINE,
-    )
-    for m in var_assign_re.finditer(code):
-        key = m.group(1).strip()
-        value = m.group(2).strip()
-        color = extract_color_from_value(value)
-        if color:
-            entries.append((key, color, m.start(), "variable"))
+    return entries
 
-    # Pattern 3: Inline style JSX — style={{ color: '#hex', backgroundColor: '#hex' }}
-    inline_style_re = re.compile(
-        r"""(color|backgroundColor|borderColor|background)\s*:\s*['"`]([^'"`\n]+)['"`]""",
-    )
-    for m in inline_style_re.finditer(code):
-        key = m.group(1).strip()
-        value = m.group(2).strip()
-        color = extract_color_from_value(value)
-        if color:
-            entries.append((key, color, m.start(), "inline_style"))
 
-    # Pattern 4: Template literal color — `${something}` patterns with hex
-    # e.g., color: `#${hex}` or simpler cases
-    template_hex_re = re.compile(
-        r"""(?:color|background|bg|fill|stroke)\s*[:=]\s*[`'](\#[0-9a-fA-F]{3,8})[`']"""
-    )
-    for m in template_hex_re.finditer(code):
-        color = extract_color_from_value(m.group(1))
-        if color:
-            entries.append(("template_color", color, m.start(), "template"))
+def get_line_number(code, pos, line_table=None):
+    """
+    Get the line number for a character position.
+    Pass line_table (from build_line_table) when resolving many positions.
+    """
+    if line_table is None:
+        return code.count("\n", 0, pos) + 1
+    return bisect_right(line_table[0], pos)
 
-    # Pattern 5: Tailwind config theme.extend.colors
-    tw_color_re = re.compile(
-        r"""['"]?([\w-]+)['"]?\s*:\s*['"](\#[0-9a-fA-F]{3,8})['"]""",
-    )
-    for m in tw_color_re.finditer(code):
-        key = m.group(1)
-        value = m.group(2)
-        color = extract_color_from_value(value)
-        if color:
-            # Avoid re-adding if already found
-            entries.append((key, color, m.start(), "config"))
 
-    return entries
+def build_line_table(code):
+    """
+    Per-line data for build_context_path, computed once per file:
+    (line start offsets, indent widths, key opening each line or None,
+    nearest earlier line with a smaller indent or -1).
+    """
+    lines = code.split("\n")
+    count = len(lines)
+    starts, indents, keys, shallower = [0] * count, [0] * count, [None] * count, [0] * count
+    offset = 0
+    for n, line in enumerate(lines):
+        # split/lstrip run in C; measured faster than a per-line regex here
+        stripped = line.lstrip()
+        indent = len(line) - len(stripped)
+        if stripped:
+            key_match = LINE_KEY_RE.match(stripped)
+            if key_match:
+                keys[n] = key_match.group(1)
 
+        prev = n - 1
+        while prev >= 0 and indents[prev] >= indent:
+            prev = shallower[prev]
 
-def get_line_number(code, pos):
-    """Get the line number for a character position."""
-    return code[:pos].count("\n") + 1
+        starts[n] = offset
+        indents[n] = indent
+        shallower[n] = prev
+        offset += len(line) + 1
+    return starts, indents, keys, shallower
 
 
-def build_context_path(code, pos):
+def build_context_path(code, pos, line_table=None):
     """
     Try to determine the nesting context for a position in the code.
     Returns a path like 'theme.colors.primary' or 'dark.text'.
+    Pass line_table (from build_line_table) when resolving many positions.
     """
-    # Look backwards from pos to find enclosing keys
-    before = code[:pos]
-    # Find recent key assignments at lower indent levels
-    parts = []
-    lines = before.split("\n")
-    current_indent = len(lines[-1]) - len(lines[-1].lstrip()) if lines else 0
+    if line_table is None:
+        line_table = build_line_table(code)
+    starts, indents, keys, shallower = line_table
 
-    for line in reversed(lines[:-1]):
-        stripped = line.lstrip()
-        indent = len(line) - len(stripped)
-        if indent < current_indent:
-            # Try to extract a key from this line
-            key_match = re.match(r"""['"]?([\w.$-]+)['"]?\s*[:={]""", stripped)
-            if key_match:
-                parts.insert(0, key_match.group(1))
-                current_indent = indent
+    line = bisect_right(starts, pos) - 1
+    current_indent = min(indents[line], pos - starts[line])
+
+    # Walk back through enclosing lines, collecting keys at lower indent levels
+    parts = []
+    i = line - 1
+    while i >= 0:
+        indent = indents[i]
+        if indent >= current_indent:
+            # Every line between here and the jump target is at least as deep
+            i = shallower[i]
+            continue
+        if keys[i] is not None:
+            parts.append(keys[i])
+            current_indent = indent
         if indent == 0 and parts:
             break
+        i -= 1
 
-    return ".".join(parts) if parts else ""
+    parts.reverse()
+    return ".".join(parts)
 
 
 # ═══════════════════════════════════════════════════════════════
 # Pair Matching Logic
 # ═══════════════════════════════════════════════════════════════
 
+# One extracted color, located and classified. Tuples keep the per-entry
+# footprint small; role and source are shared literal strings.
+ColorEntry = namedtuple("ColorEntry", "key full_path color role line source context")
+
+# Each text color is paired with at most this many backgrounds of its context;
+# large token groups would otherwise produce every text × background pair
+MAX_PAIRS_PER_TEXT = 4
+
+
+def _nearest_backgrounds(text_entry, bg_entries):
+    """
+    The backgrounds to pair text_entry with, in their original order.
+    Backgrounds whose key stem prefixes the text key come first, then the
+    closest by line.
+    """
+    if len(bg_entries) <= MAX_PAIRS_PER_TEXT:
+        return bg_entries
+    text_key = text_entry.key.lower()
+    text_line = text_entry.line
+    ranked = sorted(
+        range(len(bg_entries)),
+        key=lambda i: (
+            not text_key.startswith(bg_entries[i].key.lower().split(".")[0]),
+            abs(bg_entries[i].line - text_line),
+        ),
+    )
+    return [bg_entries[i] for i in sorted(ranked[:MAX_PAIRS_PER_TEXT])]
+
+
 def find_color_pairs(entries, code):
     """
     Match text/background color pairs from extracted entries.
@@ -311,21 +440,15 @@ def find_color_pairs(entries, code):
 
     # Group entries by their nesting context
     contexts = {}
+    line_table = build_line_table(code)
     for key, color, pos, source in entries:
-        ctx = build_context_path(code, pos)
+        # Entries of one context share a single path string
+        ctx = sys.intern(build_context_path(code, pos, line_table))
         full_path = f"{ctx}.{key}" if ctx else key
         role = classify_key(full_path)
-        line = get_line_number(code, pos)
-
-        entry = {
-            "key": key,
-            "full_path": full_path,
-            "color": color,
-            "role": role,
-            "line": line,
-            "source": source,
-            "context": ctx,
-        }
+        line = get_line_number(code, pos, line_table)
+
+        entry = ColorEntry(key, full_path, color, role, line, source, ctx)
 
         if ctx not in contexts:
             contexts[ctx] = []
@@ -333,9 +456,9 @@ def find_color_pairs(entries, code):
 
     # Within each context group, pair text colors with background colors
     for ctx, group in contexts.items():
-        text_entries = [e for e in group if e["role"] == "text"]
-        bg_entries = [e for e in group if e["role"] == "background"]
-        border_entries = [e for e in group if e["role"] == "border"]
+        text_entries = [e for e in group if e.role == "text"]
+        bg_entries = [e for e in group if e.role == "background"]
+        border_entries = [e for e in group if e.role == "border"]
 
         # Default background fallback
         default_bg = "#ffffff"
@@ -346,67 +469,67 @@ def find_color_pairs(entries, code):
 
         for te in text_entries:
             if bg_entries:
-                for be in bg_entries:
+                for be in _nearest_backgrounds(te, bg_entries):
                     pairs.append({
-                        "text_color": te["color"],
-                        "bg_color": be["color"],
-                        "text_key": te["full_path"],
-                        "bg_key": be["full_path"],
-                        "text_line": te["line"],
-                        "bg_line": be["line"],
+                        "text_color": te.color,
+                        "bg_color": be.color,
+                        "text_key": te.full_path,
+                        "bg_key": be.full_path,
+                        "text_line": te.line,
+                        "bg_line": be.line,
                         "context": ctx,
-                        "source": f"{te['source']}: {te['key']} + {be['key']}",
+                        "source": f"{te.source}: {te.key} + {be.key}",
                     })
             else:
                 # No explicit background in this context — use default
                 pairs.append({
-                    "text_color": te["color"],
+                    "text_color": te.color,
                     "bg_color": default_bg,
-                    "text_key": te["full_path"],
+                    "text_key": te.full_path,
                     "bg_key": f"(default: {default_bg})",
-                    "text_line": te["line"],
+                    "text_line": te.line,
                     "bg_line": None,
                     "context": ctx,
-                    "source": f"{te['source']}: {te['key']} (no explicit background)",
+                    "source": f"{te.source}: {te.key} (no explicit background)",
                 })
 
         # Border vs background (SC 1.4.11)
         for boe in border_entries:
-            bg = bg_entries[0]["color"] if bg_entries else default_bg
-            bg_key = bg_entries[0]["full_path"] if bg_entries else f"(default: {default_bg})"
+            bg = bg_entries[0].color if bg_entries else default_bg
+            bg_key = bg_entries[0].full_path if bg_entries else f"(default: {default_bg})"
             pairs.append({
-                "text_color": boe["color"],
+                "text_color": boe.color,
                 "bg_color": bg,
-                "text_key": boe["full_path"],
+                "text_key": boe.full_path,
                 "bg_key": bg_key,
-                "text_line": boe["line"],
-                "bg_line": bg_entries[0]["line"] if bg_entries else None,
+                "text_line": boe.line,
+                "bg_line": bg_entries[0].line if bg_entries else None,
                 "context": ctx,
-                "source": f"border vs background (SC 1.4.11): {boe['key']}",
+                "source": f"border vs background (SC 1.4.11): {boe.key}",
             })
 
     # Also try to pair any unmatched "unknown" colors that appear adjacent
     # in theme-like structures (e.g., primary: '#blue', onPrimary: '#white')
     for ctx, group in contexts.items():
-        unknowns = [e for e in group if e["role"] == "unknown"]
+        unknowns = [e for e in group if e.role == "unknown"]
         for e in unknowns:
-            key_lower = e["key"].lower()
+            key_lower = e.key.lower()
             # Check for "on" prefix pattern: onPrimary, onSurface, etc.
             on_match = re.match(r"on[_-]?(\w+)", key_lower)
             if on_match:
                 base_name = on_match.group(1)
                 # Find the corresponding base color in the same context
                 for other in group:
-                    if other["key"].lower() == base_name or other["key"].lower().endswith(base_name):
+                    if other.key.lower() == base_name or other.key.lower().endswith(base_name):
                         pairs.append({
-                            "text_color": e["color"],
-                            "bg_color": other["color"],
-                            "text_key": e["full_path"],
-                            "bg_key": other["full_path"],
-                            "text_line": e["line"],
-                            "bg_line": other["line"],
+                            "text_color": e.color,
+                            "bg_color": other.color,
+                            "text_key": e.full_path,
+                            "bg_key": other.full_path,
+                            "text_line": e.line,
+                            "bg_line": other.line,
                             "context": ctx,
-                            "source": f"onX/X pattern: {e['key']} on {other['key']}",
+                            "source": f"onX/X pattern: {e.key} on {other.key}",
                         })
 
     return pairs
@@ -418,51 +541,38 @@ def find_color_pairs(entries, code):
 
 def analyze_pairs(pairs, include_cvd=False):
     """Run full contrast analysis on each pair."""
-    results = []
+    unique = []
     seen = set()
 
     for pair in pairs:
-        # Deduplicate
+        # Deduplicate: main passes the pairs of every scanned file in one
+        # call, so each (text, bg) is analyzed once per run
         dedup_key = (pair["text_color"], pair["bg_color"])
         if dedup_key in seen:
             continue
         seen.add(dedup_key)
+        unique.append(pair)
 
-        try:
-            text_hex = normalize_hex(pair["text_color"])
-            bg_hex = normalize_hex(pair["bg_color"])
-        except ValueError as e:
-            results.append({"error": str(e), **pair})
-            continue
-
-        ratio = contrast_ratio(text_hex, bg_hex)
-        rating = wcag_rating(ratio)
+    # Extraction only yields normalized hex (and the default backgrounds are
+    # written that way), so the batch can skip re-validating it. Colors
+    # shared between pairs are measured once.
+    analyses = analyze_pairs_batch(
+        [(p["text_color"], p["bg_color"]) for p in unique], include_cvd, normalized=True
+    )
 
+    results = []
+    for pair, analysis in zip(unique, analyses):
         result = {
-            "text_color": text_hex,
-            "background_color": bg_hex,
+            "text_color": pair["text_color"],
+            "background_color": pair["bg_color"],
             "text_key": pair["text_key"],
             "bg_key": pair["bg_key"],
             "text_line": pair["text_line"],
             "bg_line": pair["bg_line"],
             "context": pair["context"],
             "source": pair["source"],
-            **rating,
         }
-
-        if not rating["aa_body_text"]:
-            fix = find_fixed_color(text_hex, bg_hex, 4.5)
-            result["fix_aa"] = fix
-            result["fix_aa_ratio"] = round(contrast_ratio(fix, bg_hex), 2)
-        if not rating["aaa_body_text"]:
-            fix = find_fixed_color(text_hex, bg_hex, 7.0)
-            result["fix_aaa"] = fix
-            result["fix_aaa_ratio"] = round(contrast_ratio(fix, bg_hex), 2)
-
-        if include_cvd:
-            result["cvd"] = cvd_analysis(text_hex, bg_hex)
-            result["hue_warnings"] = check_risky_hues(text_hex, bg_hex)
-
+        result.update(analysis)
         results.append(result)
 
     return results
@@ -470,75 +580,84 @@ def analyze_pairs(pairs, include_cvd=False):
 
 def print_report(results, filepaths):
     """Print a human-readable report."""
-    issues = [r for r in results if not r.get("aa_body_text", True)]
-    warnings = [r for r in results if r.get("aa_body_text", False) and not r.get("aaa_body_text", True)]
-    passing = [r for r in results if r.get("aaa_body_text", False)]
-    errors = [r for r in results if "error" in r]
+    lines = []
+    out = lines.append
+    issues, warnings, passing, errors = [], [], [], []
+    for r in results:
+        if "error" in r:
+            errors.append(r)
+        elif not r["aa_body_text"]:
+            issues.append(r)
+        elif not r["aaa_body_text"]:
+            warnings.append(r)
+        else:
+            passing.append(r)
     total = len(results) - len(errors)
 
     files_str = ", ".join(filepaths) if len(filepaths) <= 3 else f"{len(filepaths)} files"
 
-    print()
-    print(f"{'═' * 60}")
-    print(f"  JS/TS COLOR CONTRAST SCAN REPORT")
-    print(f"  Source: {files_str}")
-    print(f"{'═' * 60}")
-    print()
-    print(f"  Found {total} color pairs")
-    print()
-    print(f"  ❌ FAIL AA:         {len(issues)} pairs")
-    print(f"  ⚠️  Pass AA only:   {len(warnings)} pairs")
-    print(f"  ✅ Pass AAA:        {len(passing)} pairs")
+    out("")
+    out(f"{'═' * 60}")
+    out(f"  JS/TS COLOR CONTRAST SCAN REPORT")
+    out(f"  Source: {files_str}")
+    out(f"{'═' * 60}")
+    out("")
+    out(f"  Found {total} color pairs")
+    out("")
+    out(f"  ❌ FAIL AA:         {len(issues)} pairs")
+    out(f"  ⚠️  Pass AA only:   {len(warnings)} pairs")
+    out(f"  ✅ Pass AAA:        {len(passing)} pairs")
     if errors:
-        print(f"  ⛔ Parse errors:    {len(errors)}")
-    print()
+        out(f"  ⛔ Parse errors:    {len(errors)}")
+    out("")
 
     if issues:
-        print(f"{'─' * 60}")
-        print(f"  ❌ FAILING PAIRS (below AA 4.5:1)")
-        print(f"{'─' * 60}")
+        out(f"{'─' * 60}")
+        out(f"  ❌ FAILING PAIRS (below AA 4.5:1)")
+        out(f"{'─' * 60}")
         for r in issues:
-            _print_issue(r)
+            _format_issue(r, out)
 
     if warnings:
-        print(f"{'─' * 60}")
-        print(f"  ⚠️  AA ONLY (pass AA but fail AAA 7:1)")
-        print(f"{'─' * 60}")
+        out(f"{'─' * 60}")
+        out(f"  ⚠️  AA ONLY (pass AA but fail AAA 7:1)")
+        out(f"{'─' * 60}")
         for r in warnings:
-            _print_issue(r)
+            _format_issue(r, out)
 
     if passing:
-        print(f"{'─' * 60}")
-        print(f"  ✅ PASSING AAA")
-        print(f"{'─' * 60}")
+        out(f"{'─' * 60}")
+        out(f"  ✅ PASSING AAA")
+        out(f"{'─' * 60}")
         for r in passing:
             loc = f"L{r['text_line']}" if r.get("text_line") else ""
-            print(f"    {r['text_key']} on {r['bg_key']}  {loc}")
-            print(f"      {r['text_color']} on {r['background_color']}  →  {r['ratio']}:1 ✅")
-            print()
+            out(f"    {r['text_key']} on {r['bg_key']}  {loc}")
+            out(f"      {r['text_color']} on {r['background_color']}  →  {r['ratio']}:1 ✅")
+            out("")
 
     if errors:
-        print(f"{'─' * 60}")
-        print(f"  ⛔ ERRORS")
-        print(f"{'─' * 60}")
+        out(f"{'─' * 60}")
+        out(f"  ⛔ ERRORS")
+        out(f"{'─' * 60}")
         for r in errors:
-            print(f"    {r.get('text_key', '?')}: {r['error']}")
-        print()
+            out(f"    {r.get('text_key', '?')}: {r['error']}")
+        out("")
 
-    print(f"{'═' * 60}")
+    out(f"{'═' * 60}")
     if not issues:
-        print(f"  ✅ All color pairs pass WCAG AA!")
+        out(f"  ✅ All color pairs pass WCAG AA!")
         if not warnings:
-            print(f"  ✅ All color pairs also pass WCAG AAA!")
+            out(f"  ✅ All color pairs also pass WCAG AAA!")
     else:
-        print(f"  ❌ {len(issues)} pair(s) need fixing to meet WCAG AA.")
-        print(f"     See suggested fix hex codes above.")
-    print(f"{'═' * 60}")
-    print()
+        out(f"  ❌ {len(issues)} pair(s) need fixing to meet WCAG AA.")
+        out(f"     See suggested fix hex codes above.")
+    out(f"{'═' * 60}")
+    out("")
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
-def _print_issue(r):
-    """Print a single issue."""
+def _format_issue(r, out):
+    """Append the lines for a single issue to out."""
     loc_parts = []
     if r.get("text_line"):
         loc_parts.append(f"text L{r['text_line']}")
@@ -546,35 +665,35 @@ def _print_issue(r):
         loc_parts.append(f"bg L{r['bg_line']}")
     loc = f"  ({', '.join(loc_parts)})" if loc_parts else ""
 
-    print()
-    print(f"    Context:     {r.get('context', '-') or '(root)'}")
-    print(f"    Source:      {r['source']}")
-    print(f"    Text:        {r['text_color']}  ← {r['text_key']}{loc}")
-    print(f"    Background:  {r['background_color']}  ← {r['bg_key']}")
-    print(f"    Contrast:    {r['ratio']}:1")
-    print(f"    AA Body:     {'✅' if r['aa_body_text'] else '❌'}  "
+    out("")
+    out(f"    Context:     {r.get('context', '-') or '(root)'}")
+    out(f"    Source:      {r['source']}")
+    out(f"    Text:        {r['text_color']}  ← {r['text_key']}{loc}")
+    out(f"    Background:  {r['background_color']}  ← {r['bg_key']}")
+    out(f"    Contrast:    {r['ratio']}:1")
+    out(f"    AA Body:     {'✅' if r['aa_body_text'] else '❌'}  "
           f"AA Large: {'✅' if r['aa_large_text'] else '❌'}  "
           f"AAA Body: {'✅' if r['aaa_body_text'] else '❌'}  "
           f"AAA Large: {'✅' if r['aaa_large_text'] else '❌'}")
 
     if "fix_aa" in r:
-        print(f"    Fix for AA:  {r['fix_aa']}  →  {r['fix_aa_ratio']}:1")
+        out(f"    Fix for AA:  {r['fix_aa']}  →  {r['fix_aa_ratio']}:1")
     if "fix_aaa" in r:
-        print(f"    Fix for AAA: {r['fix_aaa']}  →  {r['fix_aaa_ratio']}:1")
+        out(f"    Fix for AAA: {r['fix_aaa']}  →  {r['fix_aaa_ratio']}:1")
 
     if r.get("cvd"):
         icons = {"protanopia": "🔴", "deuteranopia": "🟢", "tritanopia": "🔵"}
         risk_str = {"critical": "❌ CRITICAL", "high": "⚠️  HIGH", "warning": "⚠️  WARN", "ok": "✅ OK"}
         for cvd in r["cvd"]:
             icon = icons.get(cvd["type"], "•")
-            print(f"    {icon} {cvd['type']:15s} {cvd['simulated_ratio']:5.2f}:1  "
+            out(f"    {icon} {cvd['type']:15s} {cvd['simulated_ratio']:5.2f}:1  "
                   f"ΔE={cvd['delta_e']:5.1f}  {risk_str.get(cvd['risk'], cvd['risk'])}")
 
     if r.get("hue_warnings"):
         for w in r["hue_warnings"]:
-            print(f"    ⚠️  {w}")
+            out(f"    ⚠️  {w}")
 
-    print()
+    out("")
 
 
 # ═══════════════════════════════════════════════════════════════
@@ -582,6 +701,7 @@ def _print_issue(r):
 # ═══════════════════════════════════════════════════════════════
 
 SUPPORTED_EXTENSIONS = {".js", ".jsx", ".ts", ".tsx", ".mjs", ".cjs"}
+_EXTENSION_SUFFIXES = tuple(SUPPORTED_EXTENSIONS)
 
 
 def collect_files(path, recursive=False):
@@ -590,27 +710,62 @@ def collect_files(path, recursive=False):
         return [path]
 
     if os.path.isdir(path):
-        files = []
         if recursive:
-            for root, dirs, filenames in os.walk(path):
-                # Skip node_modules, .next, dist, build
-                dirs[:] = [d for d in dirs if d not in (
-                    "node_modules", ".next", "dist", "build", ".git",
-                    "__pycache__", ".turbo", ".cache", "coverage"
-                )]
-                for f in filenames:
-                    if os.path.splitext(f)[1] in SUPPORTED_EXTENSIONS:
-                        files.append(os.path.join(root, f))
-        else:
-            for f in os.listdir(path):
-                if os.path.splitext(f)[1] in SUPPORTED_EXTENSIONS:
-                    files.append(os.path.join(path, f))
+            return sorted(walk_files(path, _EXTENSION_SUFFIXES))
+        files = []
+        for f in os.listdir(path):
+            if os.path.splitext(f)[1] in SUPPORTED_EXTENSIONS:
+                files.append(os.path.join(path, f))
         return sorted(files)
 
     # Glob pattern
     return sorted(glob.glob(path))
 
 
+# Every color extract_color_from_value accepts contains one of these
+_NAMED_COLOR_BYTES_RE = re.compile(
+    b"|".join(re.escape(name.encode()) for name in NAMED_COLORS), re.IGNORECASE
+)
+
+
+def _may_contain_color(data):
+    """Cheap screen: False only when the file cannot hold a color value."""
+    return (
+        b"#" in data
+        or b"rgb" in data
+        or b"hsl" in data
+        or _NAMED_COLOR_BYTES_RE.search(data) is not None
+    )
+
+
+def _scan_one(filepath):
+    """Parse one file. Returns (pairs, warning); warning is None on success."""
+    try:
+        with open(filepath, "rb") as f:
+            data = f.read()
+    except IOError as e:
+        return [], f"Warning: Could not read {filepath}: {e}"
+
+    # Bundles and plain modules often hold no color at all; screening the raw
+    # bytes avoids decoding and tokenizing them
+    if not _may_contain_color(data):
+        return [], None
+
+    code = data.decode("utf-8", errors="replace")
+    if "\r" in code:
+        code = code.replace("\r\n", "\n").replace("\r", "\n")
+    code = strip_comments(code)
+    entries = extract_key_value_pairs(code)
+    if not entries:
+        return [], None
+
+    pairs = find_color_pairs(entries, code)
+    # Tag pairs with their source file
+    for p in pairs:
+        p["file"] = filepath
+    return pairs, None
+
+
 def main():
     args = sys.argv[1:]
 
@@ -657,23 +812,10 @@ def main():
 
     # Parse all files
     all_pairs = []
-    for filepath in all_files:
-        try:
-            with open(filepath, "r", encoding="utf-8", errors="replace") as f:
-                code = f.read()
-        except IOError as e:
-            print(f"Warning: Could not read {filepath}: {e}", file=sys.stderr)
-            continue
-
-        code = strip_comments(code)
-        entries = extract_key_value_pairs(code)
-
-        if entries:
-            pairs = find_color_pairs(entries, code)
-            # Tag pairs with their source file
-            for p in pairs:
-                p["file"] = filepath
-            all_pairs.extend(pairs)
+    for pairs, warning in map_files(_scan_one, all_files):
+        if warning:
+            print(warning, file=sys.stderr)
+        all_pairs.extend(pairs)
 
     if not all_pairs:
         msg = f"No text/background color pairs found in {len(all_files)} file(s)."
@@ -687,7 +829,8 @@ def main():
 
     # Output
     if output_json:
-        print(json.dumps(results, indent=2))
+        json.dump(results, sys.stdout, indent=2)
+        sys.stdout.write("\n")
     else:
         print_report(results, all_files)
 
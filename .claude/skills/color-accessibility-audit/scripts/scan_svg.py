@@ -25,19 +25,43 @@ import sys
 import re
 import json
 import os
-import xml.etree.ElementTree as ET
+import colorsys
+from collections import namedtuple
+from functools import lru_cache
+
+# Optional: lxml parses several times faster than the stdlib ElementTree and
+# is API-compatible for everything used here.
+try:
+    from lxml import etree as ET
+except ImportError:
+    import xml.etree.ElementTree as ET
+    XML_PARSER = None
+    XML_BACKEND = "stdlib"
+else:
+    XML_BACKEND = "lxml " + ".".join(map(str, ET.LXML_VERSION))
+    # Match expat: expand entities declared in the document itself, but never
+    # load external ones. Comments and PIs would otherwise appear as children.
+    # lxml < 5 cannot expand internal entities only, so it leaves them as
+    # entity nodes, which walk_svg skips.
+    XML_PARSER = ET.XMLParser(
+        resolve_entities="internal" if ET.LXML_VERSION >= (5,) else False,
+        no_network=True,
+        remove_comments=True,
+        remove_pis=True,
+    )
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, SCRIPT_DIR)
 from contrast_check import (
     normalize_hex,
-    contrast_ratio,
+    contrast_ratios,
     wcag_rating,
-    find_fixed_color,
+    find_fixed_colors,
     cvd_analysis,
     check_risky_hues,
     NAMED_COLORS,
 )
+from _scan_util import map_files, walk_files
 
 # ═══════════════════════════════════════════════════════════════
 # SVG Color Extraction
@@ -47,17 +71,12 @@ from contrast_check import (
 SVG_NS = "http://www.w3.org/2000/svg"
 XLINK_NS = "http://www.w3.org/1999/xlink"
 
-# SVG elements that can contain visible text
-TEXT_ELEMENTS = {"text", "tspan", "textPath",
-                 f"{{{SVG_NS}}}text", f"{{{SVG_NS}}}tspan", f"{{{SVG_NS}}}textPath"}
+# SVG elements that can contain visible text (matched on the tag with its
+# namespace stripped)
+TEXT_ELEMENTS = frozenset({"text", "tspan", "textPath"})
 
 # SVG elements that are graphical (non-text contrast SC 1.4.11)
-GRAPHIC_ELEMENTS = {
-    "rect", "circle", "ellipse", "line", "polyline", "polygon", "path",
-    f"{{{SVG_NS}}}rect", f"{{{SVG_NS}}}circle", f"{{{SVG_NS}}}ellipse",
-    f"{{{SVG_NS}}}line", f"{{{SVG_NS}}}polyline", f"{{{SVG_NS}}}polygon",
-    f"{{{SVG_NS}}}path",
-}
+GRAPHIC_ELEMENTS = frozenset({"rect", "circle", "ellipse", "line", "polyline", "polygon", "path"})
 
 # Hex color patterns
 HEX_RE = re.compile(r"^#(?:[0-9a-fA-F]{3,4}){1,2}$")
@@ -68,13 +87,18 @@ HSL_RE = re.compile(
     r"hsla?\(\s*([\d.]+)\s*,\s*([\d.]+)%\s*,\s*([\d.]+)%\s*(?:,\s*[\d.]+\s*)?\)"
 )
 
+# Named colors, already normalized
+_NAMED_HEX = {name: normalize_hex(value) for name, value in NAMED_COLORS.items()}
+
+# Values that paint nothing or depend on context, so can't be resolved statically
+UNRESOLVABLE_COLORS = frozenset(("none", "transparent", "inherit", "currentColor", "currentcolor"))
+
 
 def rgb_to_hex_str(r, g, b):
     return f"#{int(r):02x}{int(g):02x}{int(b):02x}"
 
 
 def hsl_to_hex_str(h, s, l):
-    import colorsys
     r, g, b = colorsys.hls_to_rgb(float(h) / 360, float(l) / 100, float(s) / 100)
     return rgb_to_hex_str(r * 255, g * 255, b * 255)
 
@@ -86,7 +110,7 @@ def parse_svg_color(value):
 
     value = value.strip()
 
-    if value in ("none", "transparent", "inherit", "currentColor", "currentcolor"):
+    if value in UNRESOLVABLE_COLORS:
         return None  # Can't resolve statically
 
     # Hex
@@ -113,11 +137,23 @@ def parse_svg_color(value):
             return None
 
     # Named CSS/SVG color
-    lower = value.lower()
-    if lower in NAMED_COLORS:
-        return normalize_hex(NAMED_COLORS[lower])
+    return _NAMED_HEX.get(value.lower())
+
+
+# What an absent or "none" paint parses to
+_NO_PAINT = (None, False)
 
-    return None
+
+# Icon sets repeat a handful of colors on every element, across every file
+@lru_cache(maxsize=4096)
+def parse_svg_paint(value):
+    """
+    Parse a fill/stroke value. Returns (hex or None, uses_current_color),
+    so callers don't have to re-scan the string for currentColor.
+    """
+    if not value:
+        return _NO_PAINT
+    return parse_svg_color(value), "currentcolor" in value.lower()
 
 
 def parse_style_attr(style_str):
@@ -135,7 +171,8 @@ def parse_style_attr(style_str):
 def extract_colors_from_element(elem, parent_fill=None, parent_stroke=None):
     """
     Extract fill and stroke colors from an SVG element.
-    Handles attribute inheritance from parent groups.
+    Handles attribute inheritance from parent groups. Returns
+    (tag, fill, fill_hex, stroke, stroke_hex, has_current_color).
     """
     # Get tag name without namespace
     tag = elem.tag
@@ -163,116 +200,118 @@ def extract_colors_from_element(elem, parent_fill=None, parent_stroke=None):
         stroke = parent_stroke
 
     # Parse colors
-    fill_hex = parse_svg_color(fill) if fill and fill != "none" else None
-    stroke_hex = parse_svg_color(stroke) if stroke and stroke != "none" else None
+    fill_hex, fill_current = parse_svg_paint(fill) if fill and fill != "none" else _NO_PAINT
+    stroke_hex, stroke_current = parse_svg_paint(stroke) if stroke and stroke != "none" else _NO_PAINT
 
-    return {
-        "tag": tag,
-        "fill": fill,
-        "fill_hex": fill_hex,
-        "stroke": stroke,
-        "stroke_hex": stroke_hex,
-        "is_text": elem.tag in TEXT_ELEMENTS,
-        "is_graphic": elem.tag in GRAPHIC_ELEMENTS,
-        "has_current_color": (fill and "currentcolor" in fill.lower()) or
-                             (stroke and "currentcolor" in stroke.lower()),
-    }
+    return tag, fill, fill_hex, stroke, stroke_hex, fill_current or stroke_current
 
 
-def walk_svg(elem, parent_fill=None, parent_stroke=None, results=None):
-    """Recursively walk SVG tree, extracting colors with inheritance."""
-    if results is None:
-        results = []
+# Element data as parallel lists (one entry per element, document order)
+# rather than a dict per element, plus the fill of the first filled <rect>
+SvgElements = namedtuple(
+    "SvgElements", "tags fill_hex stroke_hex is_text is_graphic has_current_color first_rect_fill"
+)
+
 
-    info = extract_colors_from_element(elem, parent_fill, parent_stroke)
-    results.append(info)
+def walk_svg(elem, parent_fill=None, parent_stroke=None):
+    """Walk the SVG tree in document order, extracting colors with inheritance."""
+    tags, fills, strokes, is_text, is_graphic, current_color = [], [], [], [], [], []
+    first_rect_fill = None
 
-    # Pass fill/stroke down to children (group inheritance)
-    child_fill = info["fill"] if info["fill"] and info["fill"] != "none" else parent_fill
-    child_stroke = info["stroke"] if info["stroke"] and info["stroke"] != "none" else parent_stroke
+    # Explicit stack instead of recursion: no call frame per element, and
+    # deeply nested documents can't hit the recursion limit
+    stack = [(elem, parent_fill, parent_stroke)]
+    while stack:
+        node, inherited_fill, inherited_stroke = stack.pop()
+        if not isinstance(node.tag, str):
+            # Unexpanded entity reference (lxml < 5): no tag, attributes or children
+            continue
+        tag, fill, fill_hex, stroke, stroke_hex, has_current_color = \
+            extract_colors_from_element(node, inherited_fill, inherited_stroke)
+        tags.append(tag)
+        fills.append(fill_hex)
+        strokes.append(stroke_hex)
+        is_text.append(tag in TEXT_ELEMENTS)
+        is_graphic.append(tag in GRAPHIC_ELEMENTS)
+        current_color.append(has_current_color)
+        if first_rect_fill is None and tag == "rect" and fill_hex:
+            first_rect_fill = fill_hex
 
-    for child in elem:
-        walk_svg(child, child_fill, child_stroke, results)
+        # Pass fill/stroke down to children (group inheritance)
+        child_fill = fill if fill and fill != "none" else inherited_fill
+        child_stroke = stroke if stroke and stroke != "none" else inherited_stroke
 
-    return results
+        # Reversed, so the first child is popped (and visited) first
+        stack.extend([(child, child_fill, child_stroke) for child in reversed(node)])
+
+    return SvgElements(tags, fills, strokes, is_text, is_graphic, current_color, first_rect_fill)
 
 
 def find_svg_pairs(elements, default_bg="#ffffff"):
     """
-    Build color pairs from SVG element data.
+    Build color pairs from SVG element data (an SvgElements).
     - Text elements: text color (fill) vs background
     - Graphic elements: fill vs stroke, fill vs background
     """
     pairs = []
     current_color_warnings = []
 
-    # Collect all unique fills as potential backgrounds
-    all_fills = set()
-    for e in elements:
-        if e["fill_hex"]:
-            all_fills.add(e["fill_hex"])
-
     # Determine the most likely background
     # If there's a rect that covers the canvas (usually first rect), use its fill
-    bg_color = default_bg
-    for e in elements:
-        if e["tag"] == "rect" and e["fill_hex"]:
-            bg_color = e["fill_hex"]
-            break
+    bg_color = elements.first_rect_fill or default_bg
+
+    # The same (foreground, background, type) recurs on element after element;
+    # analyze_pairs keeps only the first, so don't build the rest. The hex
+    # strings come from parse_svg_paint's cache, so they already carry their
+    # hash: packing them into ints for the key would only add work.
+    seen = set()
 
-    for e in elements:
+    def add_pair(foreground, background, fg_source, bg_source, pair_type, wcag_sc):
+        key = (foreground, background, pair_type)
+        if key in seen:
+            return
+        seen.add(key)
+        pairs.append({
+            "foreground": foreground,
+            "background": background,
+            "fg_source": fg_source,
+            "bg_source": bg_source,
+            "type": pair_type,
+            "wcag_sc": wcag_sc,
+        })
+
+    for tag, fill_hex, stroke_hex, is_text, is_graphic, has_current_color in zip(
+        elements.tags, elements.fill_hex, elements.stroke_hex,
+        elements.is_text, elements.is_graphic, elements.has_current_color,
+    ):
         # Flag currentColor usage
-        if e["has_current_color"]:
+        if has_current_color:
             current_color_warnings.append(
-                f"<{e['tag']}> uses currentColor — contrast depends on parent CSS context"
+                f"<{tag}> uses currentColor — contrast depends on parent CSS context"
             )
             continue
 
         # Text elements — text color (fill) vs background
-        if e["is_text"] and e["fill_hex"]:
-            pairs.append({
-                "foreground": e["fill_hex"],
-                "background": bg_color,
-                "fg_source": f"<{e['tag']}> fill",
-                "bg_source": "SVG background",
-                "type": "text",
-                "wcag_sc": "SC 1.4.3 (text contrast)",
-            })
+        if is_text and fill_hex:
+            add_pair(fill_hex, bg_color, f"<{tag}> fill", "SVG background",
+                     "text", "SC 1.4.3 (text contrast)")
 
         # Graphic elements
-        if e["is_graphic"]:
+        if is_graphic:
             # Fill vs background (non-text contrast)
-            if e["fill_hex"] and e["fill_hex"] != bg_color:
-                pairs.append({
-                    "foreground": e["fill_hex"],
-                    "background": bg_color,
-                    "fg_source": f"<{e['tag']}> fill",
-                    "bg_source": "SVG background",
-                    "type": "graphic",
-                    "wcag_sc": "SC 1.4.11 (non-text contrast)",
-                })
+            if fill_hex and fill_hex != bg_color:
+                add_pair(fill_hex, bg_color, f"<{tag}> fill", "SVG background",
+                         "graphic", "SC 1.4.11 (non-text contrast)")
 
             # Stroke vs fill (element boundary contrast)
-            if e["stroke_hex"] and e["fill_hex"] and e["stroke_hex"] != e["fill_hex"]:
-                pairs.append({
-                    "foreground": e["stroke_hex"],
-                    "background": e["fill_hex"],
-                    "fg_source": f"<{e['tag']}> stroke",
-                    "bg_source": f"<{e['tag']}> fill",
-                    "type": "stroke-vs-fill",
-                    "wcag_sc": "SC 1.4.11 (non-text contrast)",
-                })
+            if stroke_hex and fill_hex and stroke_hex != fill_hex:
+                add_pair(stroke_hex, fill_hex, f"<{tag}> stroke", f"<{tag}> fill",
+                         "stroke-vs-fill", "SC 1.4.11 (non-text contrast)")
 
             # Stroke vs background
-            if e["stroke_hex"] and e["stroke_hex"] != bg_color:
-                pairs.append({
-                    "foreground": e["stroke_hex"],
-                    "background": bg_color,
-                    "fg_source": f"<{e['tag']}> stroke",
-                    "bg_source": "SVG background",
-                    "type": "stroke-vs-bg",
-                    "wcag_sc": "SC 1.4.11 (non-text contrast)",
-                })
+            if stroke_hex and stroke_hex != bg_color:
+                add_pair(stroke_hex, bg_color, f"<{tag}> stroke", "SVG background",
+                         "stroke-vs-bg", "SC 1.4.11 (non-text contrast)")
 
     return pairs, current_color_warnings
 
@@ -280,7 +319,7 @@ def find_svg_pairs(elements, default_bg="#ffffff"):
 def parse_svg_file(filepath):
     """Parse an SVG file and extract color pairs."""
     try:
-        tree = ET.parse(filepath)
+        tree = ET.parse(filepath, XML_PARSER)
         root = tree.getroot()
     except ET.ParseError:
         # Try extracting SVG from JSX/TSX
@@ -290,16 +329,44 @@ def parse_svg_file(filepath):
     return find_svg_pairs(elements)
 
 
+# Inline SVG in JSX/TSX: the blocks, and the JSX spellings of SVG attributes
+SVG_BLOCK_RE = re.compile(r"(<svg[^>]*>.*?</svg>)", re.DOTALL | re.IGNORECASE)
+# Most components hold no inline SVG; this screens the raw bytes before decoding
+SVG_OPEN_BYTES_RE = re.compile(rb"<svg", re.IGNORECASE)
+JSX_ATTR_NAMES = {
+    "className": "class",
+    "strokeWidth": "stroke-width",
+    "strokeLinecap": "stroke-linecap",
+    "strokeLinejoin": "stroke-linejoin",
+    "fillRule": "fill-rule",
+    "clipRule": "clip-rule",
+    "clipPath": "clip-path",
+}
+JSX_ATTR_RE = re.compile("(" + "|".join(JSX_ATTR_NAMES) + ")=")
+JSX_EXPR_RE = re.compile(r"=\{[^}]+\}")
+
+
+def _rename_jsx_attr(match):
+    return JSX_ATTR_NAMES[match.group(1)] + "="
+
+
 def parse_inline_svg(filepath):
     """Extract inline SVG from JSX/TSX files."""
     try:
-        with open(filepath, "r", encoding="utf-8", errors="replace") as f:
-            content = f.read()
+        with open(filepath, "rb") as f:
+            data = f.read()
     except IOError:
         return [], []
 
+    if SVG_OPEN_BYTES_RE.search(data) is None:
+        return [], []
+
+    content = data.decode("utf-8", errors="replace")
+    if "\r" in content:
+        content = content.replace("\r\n", "\n").replace("\r", "\n")
+
     # Find <svg>...</svg> blocks in JSX
-    svg_blocks = re.findall(r"(<svg[^>]*>.*?</svg>)", content, re.DOTALL | re.IGNORECASE)
+    svg_blocks = SVG_BLOCK_RE.findall(content)
 
     all_pairs = []
     all_warnings = []
@@ -307,19 +374,12 @@ def parse_inline_svg(filepath):
     for svg_str in svg_blocks:
         # Clean JSX attributes for XML parsing
         # Convert className to class, camelCase to kebab-case for common attrs
-        cleaned = svg_str
-        cleaned = re.sub(r'className=', 'class=', cleaned)
-        cleaned = re.sub(r'strokeWidth=', 'stroke-width=', cleaned)
-        cleaned = re.sub(r'strokeLinecap=', 'stroke-linecap=', cleaned)
-        cleaned = re.sub(r'strokeLinejoin=', 'stroke-linejoin=', cleaned)
-        cleaned = re.sub(r'fillRule=', 'fill-rule=', cleaned)
-        cleaned = re.sub(r'clipRule=', 'clip-rule=', cleaned)
-        cleaned = re.sub(r'clipPath=', 'clip-path=', cleaned)
+        cleaned = JSX_ATTR_RE.sub(_rename_jsx_attr, svg_str)
         # Remove JSX expressions {var} from attributes
-        cleaned = re.sub(r'=\{[^}]+\}', '="dynamic"', cleaned)
+        cleaned = JSX_EXPR_RE.sub('="dynamic"', cleaned)
 
         try:
-            root = ET.fromstring(cleaned)
+            root = ET.fromstring(cleaned, XML_PARSER)
             elements = walk_svg(root)
             pairs, warnings = find_svg_pairs(elements)
             all_pairs.extend(pairs)
@@ -337,8 +397,10 @@ def parse_inline_svg(filepath):
 def analyze_pairs(pairs, include_cvd=False):
     results = []
     seen = set()
+    valid = []
 
     for pair in pairs:
+        # find_svg_pairs dedupes within an SVG; this catches repeats across files
         dedup_key = (pair["foreground"], pair["background"], pair["type"])
         if dedup_key in seen:
             continue
@@ -351,7 +413,15 @@ def analyze_pairs(pairs, include_cvd=False):
             results.append({"error": str(e), **pair})
             continue
 
-        ratio = contrast_ratio(fg_hex, bg_hex)
+        # Placeholder keeps errors and results in input order
+        valid.append((len(results), pair, fg_hex, bg_hex))
+        results.append(None)
+
+    # One batch pass: each distinct color's luminance is computed once
+    ratios = contrast_ratios([(fg_hex, bg_hex) for _, _, fg_hex, bg_hex in valid])
+    cvd_by_colors = {}
+
+    for (index, pair, fg_hex, bg_hex), ratio in zip(valid, ratios):
         rating = wcag_rating(ratio)
 
         # For non-text elements, the threshold is 3:1 (SC 1.4.11)
@@ -372,21 +442,36 @@ def analyze_pairs(pairs, include_cvd=False):
             **rating,
         }
 
+        # Both fixes share one parse of the colors
+        wants_aaa_fix = is_text and not rating["aaa_body_text"]
+        targets = []
         if not passes_minimum:
-            fix_hex = find_fixed_color(fg_hex, bg_hex, min_ratio)
-            result["fix_hex"] = fix_hex
-            result["fix_ratio"] = round(contrast_ratio(fix_hex, bg_hex), 2)
-
-        if is_text and not rating["aaa_body_text"]:
-            fix_hex = find_fixed_color(fg_hex, bg_hex, 7.0)
-            result["fix_aaa_hex"] = fix_hex
-            result["fix_aaa_ratio"] = round(contrast_ratio(fix_hex, bg_hex), 2)
+            targets.append(min_ratio)
+        if wants_aaa_fix:
+            targets.append(7.0)
+        if targets:
+            fixes = find_fixed_colors(fg_hex, bg_hex, targets)
+            if not passes_minimum:
+                fix_hex, fix_ratio = fixes[0]
+                result["fix_hex"] = fix_hex
+                result["fix_ratio"] = round(fix_ratio, 2)
+            if wants_aaa_fix:
+                fix_hex, fix_ratio = fixes[-1]
+                result["fix_aaa_hex"] = fix_hex
+                result["fix_aaa_ratio"] = round(fix_ratio, 2)
 
         if include_cvd:
-            result["cvd"] = cvd_analysis(fg_hex, bg_hex)
-            result["hue_warnings"] = check_risky_hues(fg_hex, bg_hex)
-
-        results.append(result)
+            # The same colors often come back as a different pair type; reuse
+            # the simulation, copied so results never share mutable state
+            cached = cvd_by_colors.get((fg_hex, bg_hex))
+            if cached is None:
+                cached = cvd_by_colors[fg_hex, bg_hex] = (
+                    cvd_analysis(fg_hex, bg_hex, ratio), check_risky_hues(fg_hex, bg_hex))
+            cvd, hue_warnings = cached
+            result["cvd"] = [dict(entry) for entry in cvd]
+            result["hue_warnings"] = list(hue_warnings)
+
+        results[index] = result
 
     return results
 
@@ -487,37 +572,150 @@ JSX_EXTENSIONS = {".jsx", ".tsx"}  # For inline SVG detection
 ALL_EXTENSIONS = SVG_EXTENSIONS | JSX_EXTENSIONS
 
 
+_EXTENSION_SUFFIXES = tuple(ALL_EXTENSIONS)
+
+
 def collect_files(path, recursive=False):
     if os.path.isfile(path):
         return [path]
     if os.path.isdir(path):
-        files = []
         if recursive:
-            for root, dirs, filenames in os.walk(path):
-                dirs[:] = [d for d in dirs if d not in (
-                    "node_modules", ".next", "dist", "build", ".git",
-                    "__pycache__", ".turbo", ".cache", "coverage"
-                )]
-                for f in filenames:
-                    if os.path.splitext(f)[1] in ALL_EXTENSIONS:
-                        files.append(os.path.join(root, f))
-        else:
-            for f in os.listdir(path):
-                if os.path.splitext(f)[1] in ALL_EXTENSIONS:
-                    files.append(os.path.join(path, f))
+            return sorted(walk_files(path, _EXTENSION_SUFFIXES))
+        files = []
+        for f in os.listdir(path):
+            if os.path.splitext(f)[1] in ALL_EXTENSIONS:
+                files.append(os.path.join(path, f))
         return sorted(files)
     return []
 
 
+def _parse_one(filepath):
+    """Parse one file by type. Returns (pairs, current_color_warnings)."""
+    ext = os.path.splitext(filepath)[1]
+    if ext in SVG_EXTENSIONS:
+        return parse_svg_file(filepath)
+    if ext in JSX_EXTENSIONS:
+        return parse_inline_svg(filepath)
+    return [], []
+
+
+# ═══════════════════════════════════════════════════════════════
+# Parse Cache
+# ═══════════════════════════════════════════════════════════════
+
+# Parsed (pairs, warnings) per file, reused while a file's mtime and size are
+# unchanged. Bump CACHE_VERSION when the parse output changes shape.
+CACHE_VERSION = 1
+# Entries kept across runs; the least recently used ones are dropped beyond this
+CACHE_MAX_ENTRIES = 4096
+CACHE_PATH = os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"),
+    "scan_svg",
+    "cache.json",
+)
+
+
+def _cache_fingerprint():
+    """Identifies the parser code and XML backend; the cache is discarded when either changes."""
+    parts = [CACHE_VERSION, XML_BACKEND]
+    for path in (os.path.abspath(__file__), os.path.join(SCRIPT_DIR, "contrast_check.py")):
+        try:
+            st = os.stat(path)
+            parts.extend((st.st_mtime_ns, st.st_size))
+        except OSError:
+            parts.append(None)
+    return parts
+
+
+def _load_cache():
+    """
+    Return {abspath: [mtime_ns, size, pairs, warnings]}, least recently used
+    first; empty if unusable.
+    """
+    try:
+        with open(CACHE_PATH, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("fingerprint") != _cache_fingerprint():
+        return {}
+    files = data.get("files")
+    return files if isinstance(files, dict) else {}
+
+
+def _save_cache(files):
+    """
+    Keep the most recently used entries whose files still exist and write them.
+    Best effort: an unwritable cache directory just means no caching.
+    """
+    recent = list(files.items())[-CACHE_MAX_ENTRIES:]
+    files = {key: entry for key, entry in recent if os.path.isfile(key)}
+    try:
+        os.makedirs(os.path.dirname(CACHE_PATH), exist_ok=True)
+        tmp_path = f"{CACHE_PATH}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"fingerprint": _cache_fingerprint(), "files": files}, f)
+        os.replace(tmp_path, CACHE_PATH)
+    except OSError:
+        pass
+
+
+def parse_files(filepaths, use_cache=True, jobs=None):
+    """
+    Parse files, reusing cached results for unchanged ones and parsing the
+    rest with up to jobs processes (default: one per CPU).
+    Returns one (pairs, warnings) per file, in input order.
+    """
+    cache = _load_cache() if use_cache else {}
+    results = [None] * len(filepaths)
+    misses = []  # (index, cache key or None, stat)
+    for i, filepath in enumerate(filepaths):
+        try:
+            st = os.stat(filepath)
+        except OSError:
+            misses.append((i, None, None))
+            continue
+        key = os.path.abspath(filepath)
+        entry = cache.pop(key, None)
+        if entry and entry[0] == st.st_mtime_ns and entry[1] == st.st_size:
+            results[i] = (entry[2], entry[3])
+            # Re-inserted so the dict stays in least-recently-used order
+            cache[key] = entry
+        else:
+            misses.append((i, key, st))
+
+    if misses:
+        parsed = map_files(_parse_one, [filepaths[i] for i, _, _ in misses], jobs=jobs)
+        for (i, key, st), (pairs, warnings) in zip(misses, parsed):
+            results[i] = (pairs, warnings)
+            if use_cache and key is not None:
+                cache[key] = [st.st_mtime_ns, st.st_size, pairs, warnings]
+        if use_cache:
+            _save_cache(cache)
+    return results
+
+
 def main():
     args = sys.argv[1:]
     include_cvd = "--cvd" in args
     output_json = "--json" in args
     recursive = "--recursive" in args or "-r" in args
-    args = [a for a in args if a not in ("--cvd", "--json", "--recursive", "-r")]
+    use_cache = "--no-cache" not in args
+    jobs = None
+    if "--jobs" in args:
+        i = args.index("--jobs")
+        try:
+            jobs = int(args[i + 1])
+            if jobs < 1:
+                raise ValueError
+        except (IndexError, ValueError):
+            print("Error: --jobs needs a positive number of processes.")
+            sys.exit(1)
+        del args[i:i + 2]
+    args = [a for a in args if a not in ("--cvd", "--json", "--recursive", "-r", "--no-cache")]
 
     if not args:
-        print("Usage: python3 scan_svg.py <path> [--cvd] [--json] [--recursive]")
+        print("Usage: python3 scan_svg.py <path> [--cvd] [--json] [--recursive] [--no-cache] [--jobs N]")
         print()
         print("Scans SVG files for color contrast issues.")
         print("Also finds inline SVGs in JSX/TSX files.")
@@ -526,6 +724,8 @@ def main():
         print("  --cvd        Color blindness simulation")
         print("  --json       JSON output")
         print("  --recursive  Scan directories recursively (alias: -r)")
+        print("  --no-cache   Re-parse every file, ignoring ~/.cache/scan_svg")
+        print("  --jobs N     Parse with up to N processes (default: one per CPU)")
         print()
         print("Examples:")
         print("  python3 scan_svg.py icon.svg")
@@ -544,15 +744,7 @@ def main():
     all_pairs = []
     all_cc_warnings = []
 
-    for filepath in all_files:
-        ext = os.path.splitext(filepath)[1]
-        if ext in SVG_EXTENSIONS:
-            pairs, warnings = parse_svg_file(filepath)
-        elif ext in JSX_EXTENSIONS:
-            pairs, warnings = parse_inline_svg(filepath)
-        else:
-            continue
-
+    for filepath, (pairs, warnings) in zip(all_files, parse_files(all_files, use_cache, jobs)):
         for p in pairs:
             p["file"] = filepath
         all_pairs.extend(pairs)
@@ -566,7 +758,8 @@ def main():
 
     if output_json:
         output = {"results": results, "current_color_warnings": all_cc_warnings}
-        print(json.dumps(output, indent=2))
+        json.dump(output, sys.stdout, indent=2)
+        sys.stdout.write("\n")
     else:
         print_report(results, all_cc_warnings, all_files)
 
@@ -26,6 +26,8 @@ import sys
 import re
 import json
 import os
+from collections import defaultdict
+from functools import lru_cache
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, SCRIPT_DIR)
@@ -33,10 +35,13 @@ from contrast_check import (
     normalize_hex,
     contrast_ratio,
     wcag_rating,
-    find_fixed_color,
+    find_fixed_colors,
     cvd_analysis,
     check_risky_hues,
+    hex_to_rgb,
+    rgb_to_lab,
 )
+from _scan_util import map_files, walk_files
 
 # ═══════════════════════════════════════════════════════════════
 # Tailwind v3 Default Color Palette → Hex
@@ -182,10 +187,7 @@ TAILWIND_COLORS = {
 
 def resolve_tw_color(class_suffix):
     """Resolve a Tailwind color suffix to hex. Returns hex or None."""
-    suffix = class_suffix.lower()
-    if suffix in TAILWIND_COLORS:
-        return TAILWIND_COLORS[suffix]
-    return None
+    return TAILWIND_COLORS.get(class_suffix.lower())
 
 
 # ═══════════════════════════════════════════════════════════════
@@ -195,9 +197,9 @@ def resolve_tw_color(class_suffix):
 # Matches any string literal content (single, double, backtick)
 STRING_CONTENT_RE = re.compile(
     r"""(?:className|class)\s*=\s*(?:"""
-    r"""(?:\{[^}]*\})|"""              # className={...}
-    r"""(?:"[^"]*")|"""                # className="..."
-    r"""(?:'[^']*'))""",               # className='...'
+    r"""(?:\{([^}]*)\})|"""            # className={...}
+    r"""(?:"([^"]*)")|"""              # className="..."
+    r"""(?:'([^']*)'))""",             # className='...'
     re.DOTALL,
 )
 
@@ -213,27 +215,73 @@ TW_TEMPLATE_RE = re.compile(
     re.DOTALL,
 )
 
-# Extract text-* and bg-* classes (with optional variant prefixes like dark:, hover:, etc.)
-TEXT_CLASS_RE = re.compile(
-    r"""(?:^|\s|'|"|`)"""
-    r"""((?:(?:dark|hover|focus|active|group-hover|disabled|placeholder|sm|md|lg|xl|2xl):)*"""
-    r"""text-([\w]+-\d+|white|black|inherit|transparent|current))"""
-    r"""(?=\s|'|"|`|$)"""
-)
+# Ternary branches: condition ? 'classes' : 'classes'
+TERNARY_RE = re.compile(r"""[?:]\s*['"`]([^'"`]+)['"`]""")
 
-BG_CLASS_RE = re.compile(
-    r"""(?:^|\s|'|"|`)"""
-    r"""((?:(?:dark|hover|focus|active|group-hover|disabled|placeholder|sm|md|lg|xl|2xl):)*"""
-    r"""bg-([\w]+-\d+|white|black|inherit|transparent|current))"""
-    r"""(?=\s|'|"|`|$)"""
-)
+# String literals inside a matched className/utility-call region
+QUOTED_STRING_RE = re.compile(r"""['"`]([^'"`]+)['"`]""")
 
-BORDER_CLASS_RE = re.compile(
-    r"""(?:^|\s|'|"|`)"""
-    r"""((?:(?:dark|hover|focus|active|group-hover|disabled|sm|md|lg|xl|2xl):)*"""
-    r"""border-([\w]+-\d+|white|black|inherit|transparent|current))"""
-    r"""(?=\s|'|"|`|$)"""
-)
+# Class tokens are delimited by whitespace and quotes
+CLASS_SPLIT_RE = re.compile(r"""[\s'"`]+""")
+
+# The color part of a text-*/bg-*/border-* utility
+TW_COLOR_RE = re.compile(r"[\w]+-\d+|white|black|inherit|transparent|current")
+
+# Variant prefixes (dark:, hover:, etc.) allowed in front of each utility
+TEXT_VARIANT_PREFIXES = frozenset((
+    "dark", "hover", "focus", "active", "group-hover", "disabled", "placeholder",
+    "sm", "md", "lg", "xl", "2xl",
+))
+BORDER_VARIANT_PREFIXES = TEXT_VARIANT_PREFIXES - {"placeholder"}
+
+UTILITY_KINDS = ("text", "bg", "border")
+
+# Variant group for each grouping prefix, highest priority first: a class
+# with both dark: and hover: goes in the dark group
+VARIANT_PRIORITY = ("dark", "hover", "focus")
+VARIANT_BY_PREFIX = {"dark": "dark", "hover": "hover", "group-hover": "hover", "focus": "focus"}
+
+
+# Components repeat the same handful of classes, so each distinct token is
+# classified once
+@lru_cache(maxsize=4096)
+def parse_class_token(token):
+    """
+    Split a single class token like "dark:hover:text-gray-400" into
+    (kind, color_suffix, variant), or return None if it isn't a color utility.
+    """
+    *prefixes, utility = token.split(":")
+    kind, sep, color_suffix = utility.partition("-")
+    if not sep or kind not in UTILITY_KINDS:
+        return None
+    allowed = BORDER_VARIANT_PREFIXES if kind == "border" else TEXT_VARIANT_PREFIXES
+    for prefix in prefixes:
+        if prefix not in allowed:
+            return None
+    if TW_COLOR_RE.fullmatch(color_suffix) is None:
+        return None
+
+    variants = {VARIANT_BY_PREFIX.get(prefix) for prefix in prefixes}
+    # Borders have no focus group
+    if kind == "border":
+        variants.discard("focus")
+    for variant in VARIANT_PRIORITY:
+        if variant in variants:
+            return kind, color_suffix, variant
+    return kind, color_suffix, "base"
+
+
+def _with_line_numbers(code, matches):
+    """
+    Pair each match (in ascending position order) with its 1-based line number,
+    counting only the newlines since the previous match.
+    """
+    line, last = 1, 0
+    for m in matches:
+        start = m.start()
+        line += code.count("\n", last, start)
+        last = start
+        yield m, line
 
 
 def extract_class_strings(code):
@@ -241,36 +289,39 @@ def extract_class_strings(code):
     strings = []
 
     # className="..." or className={'...'} or className={`...`}
-    for m in STRING_CONTENT_RE.finditer(code):
-        content = m.group(0)
-        line = code[:m.start()].count("\n") + 1
+    for m, line in _with_line_numbers(code, STRING_CONTENT_RE.finditer(code)):
+        expression, quoted = m.group(1), m.group(2) or m.group(3)
+        # A plain quoted value is the class string itself
+        if quoted and "'" not in quoted and '"' not in quoted and "`" not in quoted:
+            strings.append((quoted, line))
+            continue
         # Extract string contents from within
-        for s in re.findall(r"""['"`]([^'"`]+)['"`]""", content):
+        for s in QUOTED_STRING_RE.findall(expression if expression is not None else m.group(0)):
             strings.append((s, line))
 
     # clsx(), cn(), twMerge(), etc.
-    for m in UTILITY_FN_RE.finditer(code):
+    for m, line in _with_line_numbers(code, UTILITY_FN_RE.finditer(code)):
         content = m.group(1)
-        line = code[:m.start()].count("\n") + 1
-        for s in re.findall(r"""['"`]([^'"`]+)['"`]""", content):
+        for s in QUOTED_STRING_RE.findall(content):
             strings.append((s, line))
 
     # tw`...` tagged template literals
-    for m in TW_TEMPLATE_RE.finditer(code):
+    for m, line in _with_line_numbers(code, TW_TEMPLATE_RE.finditer(code)):
         content = m.group(1)
-        line = code[:m.start()].count("\n") + 1
         strings.append((content, line))
 
     # Also catch ternary patterns: condition ? 'classes' : 'classes'
-    ternary_re = re.compile(r"""[?:]\s*['"`]([^'"`]+)['"`]""")
-    for m in ternary_re.finditer(code):
+    for m, line in _with_line_numbers(code, TERNARY_RE.finditer(code)):
         content = m.group(1)
-        line = code[:m.start()].count("\n") + 1
         strings.append((content, line))
 
     return strings
 
 
+def _new_variant_group():
+    return {"text": [], "bg": [], "border": []}
+
+
 def extract_tw_pairs(class_strings):
     """
     From a list of (class_string, line) tuples, extract text/bg color pairs.
@@ -279,58 +330,28 @@ def extract_tw_pairs(class_strings):
     raw_pairs = []
 
     for class_str, line in class_strings:
-        # Separate by variant prefix (base, dark, hover, etc.)
-        variant_groups = {}
-
-        for m in TEXT_CLASS_RE.finditer(class_str):
-            full_class = m.group(1)
-            color_suffix = m.group(2)
-            # Determine variant
-            variant = "base"
-            if "dark:" in full_class:
-                variant = "dark"
-            elif "hover:" in full_class:
-                variant = "hover"
-            elif "focus:" in full_class:
-                variant = "focus"
-
-            if variant not in variant_groups:
-                variant_groups[variant] = {"text": [], "bg": [], "border": []}
-            hex_color = resolve_tw_color(color_suffix)
-            if hex_color:
-                variant_groups[variant]["text"].append((full_class, hex_color))
-
-        for m in BG_CLASS_RE.finditer(class_str):
-            full_class = m.group(1)
-            color_suffix = m.group(2)
-            variant = "base"
-            if "dark:" in full_class:
-                variant = "dark"
-            elif "hover:" in full_class:
-                variant = "hover"
-            elif "focus:" in full_class:
-                variant = "focus"
-
-            if variant not in variant_groups:
-                variant_groups[variant] = {"text": [], "bg": [], "border": []}
-            hex_color = resolve_tw_color(color_suffix)
-            if hex_color:
-                variant_groups[variant]["bg"].append((full_class, hex_color))
-
-        for m in BORDER_CLASS_RE.finditer(class_str):
-            full_class = m.group(1)
-            color_suffix = m.group(2)
-            variant = "base"
-            if "dark:" in full_class:
-                variant = "dark"
-            elif "hover:" in full_class:
-                variant = "hover"
-
-            if variant not in variant_groups:
-                variant_groups[variant] = {"text": [], "bg": [], "border": []}
-            hex_color = resolve_tw_color(color_suffix)
-            if hex_color:
-                variant_groups[variant]["border"].append((full_class, hex_color))
+        # One pass over the tokens, bucketed by utility kind. Below, colors are
+        # looked up directly (real classes are lowercase); only misses go
+        # through resolve_tw_color's case-folding.
+        found = {"text": [], "bg": [], "border": []}
+        for token in CLASS_SPLIT_RE.split(class_str):
+            parsed = parse_class_token(token)
+            if parsed:
+                kind, color_suffix, variant = parsed
+                found[kind].append((token, color_suffix, variant))
+
+        # Separate by variant prefix (base, dark, hover, etc.). Kinds are
+        # visited text, bg, border so groups are created in a stable order.
+        variant_groups = defaultdict(_new_variant_group)
+
+        for kind in UTILITY_KINDS:
+            for full_class, color_suffix, variant in found[kind]:
+                # Touch the group even when the color doesn't resolve, so
+                # groups keep their first-seen order
+                group = variant_groups[variant]
+                hex_color = TAILWIND_COLORS.get(color_suffix) or resolve_tw_color(color_suffix)
+                if hex_color:
+                    group[kind].append((full_class, hex_color))
 
         # Pair within each variant group
         for variant, group in variant_groups.items():
@@ -390,28 +411,48 @@ def extract_tw_pairs(class_strings):
 # Fix Suggestion — Tailwind Class Replacement
 # ═══════════════════════════════════════════════════════════════
 
-def find_nearest_tw_class(target_hex, prefix, color_family):
-    """Find the Tailwind class closest to a target hex value."""
+# Every palette color as (name, hex, L, a, b), converted to CIELAB once
+TAILWIND_PALETTE_LAB = tuple(
+    (name, hex_value, *rgb_to_lab(*hex_to_rgb(hex_value)))
+    for name, hex_value in TAILWIND_COLORS.items()
+    if hex_value is not None
+)
+
+
+@lru_cache(maxsize=64)
+def _palette_family(color_family):
+    """Palette entries whose name starts with color_family (all of them if empty)."""
+    if not color_family:
+        return TAILWIND_PALETTE_LAB
+    return tuple(entry for entry in TAILWIND_PALETTE_LAB if entry[0].startswith(color_family))
+
+
+def find_nearest_tw_class(target_hex, prefix, color_family, bg_hex=None, min_ratio=None):
+    """
+    Find the Tailwind class perceptually closest (CIE76 ΔE) to a target hex value.
+    Given bg_hex and min_ratio, classes that reach min_ratio on bg_hex win over
+    closer ones that don't.
+    """
     best = None
     best_diff = float("inf")
 
-    for tw_name, tw_hex in TAILWIND_COLORS.items():
-        if tw_hex is None:
-            continue
-        # Filter to same color family if specified
-        if color_family and not tw_name.startswith(color_family):
-            continue
-        try:
-            from contrast_check import hex_to_rgb, relative_luminance
-            tr, tg, tb = hex_to_rgb(target_hex)
-            cr, cg, cb = hex_to_rgb(tw_hex)
-            # Simple RGB distance
-            diff = abs(tr-cr) + abs(tg-cg) + abs(tb-cb)
-            if diff < best_diff:
-                best_diff = diff
-                best = tw_name
-        except Exception:
-            continue
+    try:
+        tl, ta, tb = rgb_to_lab(*hex_to_rgb(target_hex))
+    except ValueError:
+        return None
+
+    # Filter to same color family if specified
+    candidates = _palette_family(color_family)
+    if bg_hex and min_ratio:
+        passing = [entry for entry in candidates if contrast_ratio(entry[1], bg_hex) >= min_ratio]
+        candidates = passing or candidates
+
+    for tw_name, _, cl, ca, cb in candidates:
+        # Squared ΔE ranks the same as ΔE
+        diff = (tl - cl) ** 2 + (ta - ca) ** 2 + (tb - cb) ** 2
+        if diff < best_diff:
+            best_diff = diff
+            best = tw_name
 
     return f"{prefix}-{best}" if best else None
 
@@ -420,10 +461,35 @@ def find_nearest_tw_class(target_hex, prefix, color_family):
 # Analysis
 # ═══════════════════════════════════════════════════════════════
 
+def _analyze_colors(text_hex, bg_hex, include_cvd):
+    """
+    The numeric part of a pair's analysis, which depends only on its colors:
+    (ratio, rating, {target_ratio: (fix_hex, fix_ratio)}, cvd, hue_warnings).
+    """
+    ratio = contrast_ratio(text_hex, bg_hex)
+    rating = wcag_rating(ratio)
+
+    targets = []
+    if not rating["aa_body_text"]:
+        targets.append(4.5)
+    if not rating["aaa_body_text"]:
+        targets.append(7.0)
+    fixes = dict(zip(targets, find_fixed_colors(text_hex, bg_hex, targets))) if targets else {}
+
+    cvd = hue_warnings = None
+    if include_cvd:
+        cvd = cvd_analysis(text_hex, bg_hex, ratio)
+        hue_warnings = check_risky_hues(text_hex, bg_hex)
+    return ratio, rating, fixes, cvd, hue_warnings
+
+
 def analyze_pairs(pairs, include_cvd=False, suggest_fix_classes=False):
     """Run full contrast analysis on each pair."""
     results = []
     seen = set()
+    # The same colors recur across variants and files: analyze each
+    # (text, bg) combination once and attach it to every result
+    analysis_by_colors = {}
 
     for pair in pairs:
         dedup_key = (pair["text_color"], pair["bg_color"], pair.get("variant", ""))
@@ -438,8 +504,10 @@ def analyze_pairs(pairs, include_cvd=False, suggest_fix_classes=False):
             results.append({"error": str(e), **pair})
             continue
 
-        ratio = contrast_ratio(text_hex, bg_hex)
-        rating = wcag_rating(ratio)
+        analysis = analysis_by_colors.get((text_hex, bg_hex))
+        if analysis is None:
+            analysis = analysis_by_colors[text_hex, bg_hex] = _analyze_colors(text_hex, bg_hex, include_cvd)
+        ratio, rating, fixes, cvd, hue_warnings = analysis
 
         result = {
             "text_color": text_hex,
@@ -453,32 +521,33 @@ def analyze_pairs(pairs, include_cvd=False, suggest_fix_classes=False):
             **rating,
         }
 
-        if not rating["aa_body_text"]:
-            fix_hex = find_fixed_color(text_hex, bg_hex, 4.5)
+        if suggest_fix_classes and fixes:
+            # Determine color family from original class
+            original_suffix = pair["text_class"].split("text-")[-1] if "text-" in pair["text_class"] else ""
+            family = original_suffix.rsplit("-", 1)[0] if "-" in original_suffix else ""
+
+        if 4.5 in fixes:
+            fix_hex, fix_ratio = fixes[4.5]
             result["fix_aa_hex"] = fix_hex
-            result["fix_aa_ratio"] = round(contrast_ratio(fix_hex, bg_hex), 2)
+            result["fix_aa_ratio"] = round(fix_ratio, 2)
             if suggest_fix_classes:
-                # Determine color family from original class
-                original_suffix = pair["text_class"].split("text-")[-1] if "text-" in pair["text_class"] else ""
-                family = original_suffix.rsplit("-", 1)[0] if "-" in original_suffix else ""
-                fix_class = find_nearest_tw_class(fix_hex, "text", family)
+                fix_class = find_nearest_tw_class(fix_hex, "text", family, bg_hex, 4.5)
                 if fix_class:
                     result["fix_aa_class"] = fix_class
 
-        if not rating["aaa_body_text"]:
-            fix_hex = find_fixed_color(text_hex, bg_hex, 7.0)
+        if 7.0 in fixes:
+            fix_hex, fix_ratio = fixes[7.0]
             result["fix_aaa_hex"] = fix_hex
-            result["fix_aaa_ratio"] = round(contrast_ratio(fix_hex, bg_hex), 2)
+            result["fix_aaa_ratio"] = round(fix_ratio, 2)
             if suggest_fix_classes:
-                original_suffix = pair["text_class"].split("text-")[-1] if "text-" in pair["text_class"] else ""
-                family = original_suffix.rsplit("-", 1)[0] if "-" in original_suffix else ""
-                fix_class = find_nearest_tw_class(fix_hex, "text", family)
+                fix_class = find_nearest_tw_class(fix_hex, "text", family, bg_hex, 7.0)
                 if fix_class:
                     result["fix_aaa_class"] = fix_class
 
         if include_cvd:
-            result["cvd"] = cvd_analysis(text_hex, bg_hex)
-            result["hue_warnings"] = check_risky_hues(text_hex, bg_hex)
+            # Copies, so results never share mutable state
+            result["cvd"] = [dict(entry) for entry in cvd]
+            result["hue_warnings"] = list(hue_warnings)
 
         results.append(result)
 
@@ -588,28 +657,56 @@ def _print_issue(r):
 SUPPORTED_EXTENSIONS = {".jsx", ".tsx", ".js", ".ts"}
 
 
+_EXTENSION_SUFFIXES = tuple(SUPPORTED_EXTENSIONS)
+
+
 def collect_files(path, recursive=False):
     if os.path.isfile(path):
         return [path]
     if os.path.isdir(path):
-        files = []
         if recursive:
-            for root, dirs, filenames in os.walk(path):
-                dirs[:] = [d for d in dirs if d not in (
-                    "node_modules", ".next", "dist", "build", ".git",
-                    "__pycache__", ".turbo", ".cache", "coverage"
-                )]
-                for f in filenames:
-                    if os.path.splitext(f)[1] in SUPPORTED_EXTENSIONS:
-                        files.append(os.path.join(root, f))
-        else:
-            for f in os.listdir(path):
-                if os.path.splitext(f)[1] in SUPPORTED_EXTENSIONS:
-                    files.append(os.path.join(path, f))
+            return sorted(walk_files(path, _EXTENSION_SUFFIXES))
+        files = []
+        for f in os.listdir(path):
+            if os.path.splitext(f)[1] in SUPPORTED_EXTENSIONS:
+                files.append(os.path.join(path, f))
         return sorted(files)
     return []
 
 
+def _may_contain_color_class(data):
+    """Cheap screen: False only when no text-*, bg-* or border-* class can be present."""
+    return b"text-" in data or b"bg-" in data or b"border-" in data
+
+
+def _scan_one(filepath):
+    """Extract pairs from one file. Returns (pairs, warning); warning is None on success."""
+    try:
+        with open(filepath, "rb") as f:
+            data = f.read()
+    except IOError as e:
+        return [], f"Warning: Could not read {filepath}: {e}"
+
+    # Utilities, configs and tests rarely mention a color class; screening the
+    # raw bytes skips decoding and regex-scanning them
+    if not _may_contain_color_class(data):
+        return [], None
+
+    # One bulk decode; newlines only need translating when there is a \r
+    code = data.decode("utf-8", errors="replace")
+    if "\r" in code:
+        code = code.replace("\r\n", "\n").replace("\r", "\n")
+
+    class_strings = extract_class_strings(code)
+    if not class_strings:
+        return [], None
+
+    pairs = extract_tw_pairs(class_strings)
+    for p in pairs:
+        p["file"] = filepath
+    return pairs, None
+
+
 def main():
     args = sys.argv[1:]
     include_cvd = "--cvd" in args
@@ -644,20 +741,10 @@ def main():
         sys.exit(1)
 
     all_pairs = []
-    for filepath in all_files:
-        try:
-            with open(filepath, "r", encoding="utf-8", errors="replace") as f:
-                code = f.read()
-        except IOError as e:
-            print(f"Warning: Could not read {filepath}: {e}", file=sys.stderr)
-            continue
-
-        class_strings = extract_class_strings(code)
-        if class_strings:
-            pairs = extract_tw_pairs(class_strings)
-            for p in pairs:
-                p["file"] = filepath
-            all_pairs.extend(pairs)
+    for pairs, warning in map_files(_scan_one, all_files):
+        if warning:
+            print(warning, file=sys.stderr)
+        all_pairs.extend(pairs)
 
     if not all_pairs:
         print(f"No Tailwind text/bg color pairs found in {len(all_files)} file(s).")